@@ -0,0 +1,75 @@
+"""Count Socket.IO frames and server CPU for one search round, emitting per show versus through EmitBuffer.
+
+Usage: python benchmarks/emit_benchmark.py [seeds] [shows_per_seed]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(tempfile.mkdtemp(prefix="sonashow-bench-"))
+
+import SonaShow  # noqa: E402
+
+
+class FrameCounter:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    def emit(self, event, data=None, **kwargs):
+        payload = json.dumps([event, data])
+        self.frames += 1
+        self.bytes += len(payload)
+
+
+def build_show(seed, index):
+    return {
+        "Name": f"Show {seed}-{index}",
+        "Year": "2015",
+        "Genre": "Drama, Crime",
+        "Status": "",
+        "Img_Link": f"https://image.tmdb.org/t/p/original/poster{seed}{index}.jpg",
+        "Votes": "Votes: 1234",
+        "Rating": "Rating: 7.8",
+        "Overview": "A synthetic overview of a recommended show. " * 6,
+        "Language": "English",
+        "Popularity": 42.0,
+        "Base_Show": f"Seed {seed}",
+    }
+
+
+def run_round(push, flush, seeds, shows_per_seed, seed_latency):
+    for seed in range(seeds):
+        time.sleep(seed_latency)
+        for index in range(shows_per_seed):
+            push(build_show(seed, index))
+    flush()
+
+
+def measure(name, seeds, shows_per_seed, seed_latency, buffered):
+    counter = FrameCounter()
+    SonaShow.socketio.emit = counter.emit
+    if buffered:
+        emit_buffer = SonaShow.EmitBuffer()
+        push = lambda show: emit_buffer.push("more_shows_loaded", show)
+        flush = emit_buffer.flush
+    else:
+        push = lambda show: SonaShow.socketio.emit("more_shows_loaded", [show])
+        flush = lambda: None
+
+    cpu_start = time.process_time()
+    run_round(push, flush, seeds, shows_per_seed, seed_latency)
+    cpu_elapsed = time.process_time() - cpu_start
+    print(f"{name:<12} frames: {counter.frames:6d}   bytes: {counter.bytes:9d}   cpu: {cpu_elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    shows_per_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"Seeds: {seeds}   Shows per seed: {shows_per_seed}")
+    measure("Per show", seeds, shows_per_seed, 0.01, buffered=False)
+    measure("Buffered", seeds, shows_per_seed, 0.01, buffered=True)
@@ -0,0 +1,181 @@
+"""Local stand-ins for the TMDB, TVDB and Sonarr endpoints used by SonaShow.
+
+One threaded HTTP server answers:
+    GET  /3/search/tv                     GET  /3/tv/<id>
+    GET  /3/tv/<id>/recommendations       GET  /3/tv/<id>/similar
+    GET  /3/genre/tv/list                 GET  /3/configuration/languages
+    POST /v4/login                        GET  /v4/search
+    GET  /api/v3/series                   POST /api/v3/series
+    POST /api/v3/series/import
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeUpstream:
+    def __init__(self, library_size=1000, page_size=20, total_pages=3, latency=0.0):
+        self.library_size = library_size
+        self.page_size = page_size
+        self.total_pages = total_pages
+        self.latency = latency
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self.series_payload = json.dumps([self.build_series(index) for index in range(library_size)]).encode("utf-8")
+        self.added_tvdb_ids = set()
+        self.show_years = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="Fake_Upstream", daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_calls(self):
+        with self.lock:
+            self.calls.clear()
+
+    def record(self, endpoint):
+        with self.lock:
+            self.calls[endpoint] += 1
+
+    def claim(self, tvdb_id):
+        with self.lock:
+            if str(tvdb_id) in self.added_tvdb_ids:
+                return False
+            self.added_tvdb_ids.add(str(tvdb_id))
+            return True
+
+    def build_series(self, index):
+        return {
+            "title": f"Library Series {index} ({1990 + index % 35})",
+            "sortTitle": f"library series {index}",
+            "overview": "A library series used by the offline benchmark. " * 6,
+            "images": [{"coverType": cover, "url": f"/MediaCover/{index}/{cover}.jpg"} for cover in ("banner", "poster", "fanart")],
+            "seasons": [{"seasonNumber": season, "monitored": True, "statistics": {"episodeCount": 10, "sizeOnDisk": 1234567890}} for season in range(1, 6)],
+            "year": 1990 + index % 35,
+            "tvdbId": 100000 + index,
+            "tmdbId": 100000 + index,
+            "statistics": {"seasonCount": 5, "episodeCount": 50, "sizeOnDisk": 6172839450},
+            "id": index,
+        }
+
+    def build_show(self, show_id):
+        name = f"Recommended Show {show_id}"
+        # TVDB search answers with the same year TMDB reported, so adds resolve like they would against the real services.
+        self.show_years[name] = str(1990 + show_id % 35)
+        return {
+            "id": show_id,
+            "name": name,
+            "overview": "A recommended show returned by the offline benchmark. " * 4,
+            "popularity": (show_id % 1000) / 10,
+            "vote_average": 4.0 + (show_id % 60) / 10,
+            "vote_count": 20 + show_id % 500,
+            "original_language": ("en", "fr", "ja", "es")[show_id % 4],
+            "genre_ids": [18, 35][: 1 + show_id % 2],
+            "poster_path": f"/poster{show_id}.jpg",
+            "first_air_date": f"{1990 + show_id % 35}-01-01",
+        }
+
+    def recommendations(self, tv_show_id, endpoint, page):
+        # Recommendations overlap with the library and with other seeds, like real TMDB data.
+        offset = 0 if endpoint == "recommendations" else 50000
+        results = []
+        for index in range(self.page_size):
+            mixed = zlib.crc32(f"{endpoint}:{tv_show_id}:{page}:{index}".encode())
+            if index % 4 == 0:
+                results.append(self.build_show(100000 + mixed % max(1, self.library_size)))
+            else:
+                results.append(self.build_show(300000 + offset + mixed % 40000))
+        return {"page": page, "results": results, "total_pages": self.total_pages}
+
+    def build_handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, data):
+                body = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if upstream.latency:
+                    time.sleep(upstream.latency)
+                parsed = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(parsed.query)
+                parts = parsed.path.strip("/").split("/")
+
+                if parsed.path == "/3/search/tv":
+                    upstream.record("tmdb_search")
+                    self.send_json(200, {"results": [{"id": 200000 + zlib.crc32(query["query"][0].encode()) % 100000}]})
+                elif parts[:2] == ["3", "tv"] and len(parts) == 3:
+                    upstream.record("tmdb_details")
+                    self.send_json(200, upstream.build_show(int(parts[2])))
+                elif parts[:2] == ["3", "tv"] and len(parts) == 4:
+                    upstream.record(f"tmdb_{parts[3]}")
+                    self.send_json(200, upstream.recommendations(int(parts[2]), parts[3], int(query.get("page", ["1"])[0])))
+                elif parsed.path == "/3/genre/tv/list":
+                    upstream.record("tmdb_genres")
+                    self.send_json(200, {"genres": [{"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}]})
+                elif parsed.path == "/3/configuration/languages":
+                    upstream.record("tmdb_languages")
+                    self.send_json(200, [{"iso_639_1": code, "english_name": name} for code, name in (("en", "English"), ("fr", "French"), ("ja", "Japanese"), ("es", "Spanish"))])
+                elif parsed.path == "/v4/search":
+                    upstream.record("tvdb_search")
+                    if self.headers.get("Authorization") != "Bearer benchmark-token":
+                        self.send_json(401, {"status": "failure"})
+                        return
+                    name = query["query"][0]
+                    year = upstream.show_years.get(name, "2015")
+                    self.send_json(200, {"data": [{"name": name, "year": year, "tvdb_id": str(zlib.crc32(name.encode()))}, {"name": f"{name} Revisited", "year": "2020", "tvdb_id": "1"}]})
+                elif parsed.path == "/api/v3/series":
+                    upstream.record("sonarr_series")
+                    self.send_json(200, upstream.series_payload)
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if upstream.latency:
+                    time.sleep(upstream.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"null")
+
+                if self.path == "/v4/login":
+                    upstream.record("tvdb_login")
+                    self.send_json(200, {"data": {"token": "benchmark-token"}})
+                elif self.path == "/api/v3/series":
+                    upstream.record("sonarr_add")
+                    if not upstream.claim(body["tvdbId"]):
+                        self.send_json(400, [{"propertyName": "TvdbId", "errorMessage": "This series has already been added. It already exists in the database."}])
+                        return
+                    self.send_json(201, body)
+                elif self.path == "/api/v3/series/import":
+                    upstream.record("sonarr_import")
+                    # Like Sonarr, only the series that were actually created are returned.
+                    self.send_json(201, [series for series in body if upstream.claim(series["tvdbId"])])
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+        return Handler
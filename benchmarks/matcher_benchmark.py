@@ -0,0 +1,67 @@
+"""Compare the per-candidate TVDB title loop with the batch TitleMatcher over a few thousand titles.
+
+Usage: python benchmarks/matcher_benchmark.py [candidates] [queries]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(tempfile.mkdtemp(prefix="sonashow-bench-"))
+
+import SonaShow  # noqa: E402
+from rapidfuzz import fuzz  # noqa: E402
+from unidecode import unidecode  # noqa: E402
+
+WORDS = ["the", "night", "crown", "café", "señor", "black", "mirror", "house", "dragon", "détective", "office", "lost", "station", "eleven", "wire", "bear", "ted", "lasso", "fargo", "dark"]
+
+
+def build_candidates(count):
+    random.seed(1)
+    return [{"name": " ".join(random.choice(WORDS) for _ in range(random.randint(1, 4))).title(), "year": str(random.randint(1980, 2025)), "tvdb_id": index} for index in range(count)]
+
+
+def per_candidate_loop(show_name, show_year, shows):
+    for show in shows:
+        match_ratio = fuzz.ratio(f"{show_name.lower()} ({show_year})", show["name"].lower())
+        decoded_match_ratio = fuzz.ratio(unidecode(show_name.lower()), unidecode(show["name"].lower()))
+        if match_ratio > 90 or decoded_match_ratio > 90 and show_year == show["year"]:
+            return show["tvdb_id"]
+    return None
+
+
+def batch_matcher(show_name, show_year, matcher):
+    best_match = matcher.best_match(show_name, show_year)
+    return best_match["index"] if best_match else None
+
+
+if __name__ == "__main__":
+    candidate_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    shows = build_candidates(candidate_count)
+    queries = [("Unmatched Title Query", "1999")] * (query_count // 2) + [(show["name"], show["year"]) for show in random.sample(shows, query_count - query_count // 2)]
+    print(f"Candidates: {candidate_count}   Queries: {query_count}")
+
+    start = time.perf_counter()
+    for show_name, show_year in queries:
+        per_candidate_loop(show_name, show_year, shows)
+    loop_elapsed = time.perf_counter() - start
+    print(f"Per candidate loop   {loop_elapsed * 1000 / query_count:8.2f} ms/query")
+
+    start = time.perf_counter()
+    matcher = SonaShow.TitleMatcher([show["name"] for show in shows], [show["year"] for show in shows])
+    build_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for show_name, show_year in queries:
+        batch_matcher(show_name, show_year, matcher)
+    batch_elapsed = time.perf_counter() - start
+    print(f"Batch matcher        {batch_elapsed * 1000 / query_count:8.2f} ms/query   (build: {build_elapsed * 1000:.2f} ms)")
+
+    start = time.perf_counter()
+    for show_name, _ in queries:
+        matcher.search(show_name)
+    search_elapsed = time.perf_counter() - start
+    print(f"Library title search {search_elapsed * 1000 / query_count:8.2f} ms/query")
@@ -0,0 +1,119 @@
+"""Drive DataHandler end to end against the local fake upstream and report latency, upstream calls, memory and Socket.IO frames.
+
+Usage: python benchmarks/run_benchmarks.py [--sizes 100,1000,5000,20000] [--latency 0.02] [--page-size 20] [--pages 3] [--rounds 5] [--adds 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(tempfile.mkdtemp(prefix="sonashow-bench-"))
+os.environ.setdefault("sonarr_sync_interval", "0")
+
+import SonaShow  # noqa: E402
+from fake_upstream import FakeUpstream  # noqa: E402
+
+
+class FrameCounter:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    def emit(self, event, data=None, **kwargs):
+        self.frames += 1
+        self.bytes += len(json.dumps([event, data]))
+
+
+def point_at(data_handler, upstream):
+    data_handler.sonarr_address = upstream.url
+    data_handler.sonarr_api_key = "benchmark"
+    data_handler.tmdb_api_key = "benchmark"
+    data_handler.tmdb_base_url = f"{upstream.url}/3"
+    data_handler.tvdb_client.base_url = f"{upstream.url}/v4"
+    data_handler.tvdb_client.set_api_key("benchmark")
+    data_handler.dry_run_adding_to_sonarr = False
+    data_handler.tmdb_rate_limiter = SonaShow.RateLimiter(100000)
+    data_handler.tmdb_cache = SonaShow.TMDBCache(os.path.join(tempfile.mkdtemp(prefix="sonashow-cache-"), "tmdb_cache.db"), ttls={"search": 3600, "recommendations": 3600, "similar": 3600}, max_entries=data_handler.tmdb_cache_max_entries)
+
+
+def measure(label, upstream, counter, action):
+    upstream.reset_calls()
+    frames_before = counter.frames
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    calls = sum(upstream.calls.values())
+    breakdown = ", ".join(f"{endpoint}={count}" for endpoint, count in sorted(upstream.calls.items()))
+    print(f"  {label:<22} {elapsed * 1000:9.1f} ms   calls: {calls:5d}   peak: {peak / 1048576:7.2f} MiB   frames: {counter.frames - frames_before:5d}   ({breakdown})")
+    return result, elapsed
+
+
+def run_size(data_handler, counter, size, args):
+    upstream = FakeUpstream(library_size=size, page_size=args.page_size, total_pages=args.pages, latency=args.latency).start()
+    try:
+        point_at(data_handler, upstream)
+        session = SonaShow.ClientSession("bench")
+        data_handler.sessions[session.client_id] = session
+        print(f"Library size: {size}")
+
+        measure("Sonarr ingest", upstream, counter, lambda: data_handler.request_shows_from_sonarr(session))
+
+        seeds = [item.name for item in data_handler.sonarr_items[: max(10, min(size, 200))]]
+        session.reset(seeds, demand=10**9)
+        session.stop_event.clear()
+        round_times = []
+        for round_number in range(args.rounds):
+
+            def one_round():
+                data_handler.find_similar_shows(session)
+                data_handler.emit_buffer.flush()
+
+            _, elapsed = measure(f"Round {round_number + 1}", upstream, counter, one_round)
+            round_times.append(elapsed)
+
+        found = len(session.recommended_shows)
+        total_time = sum(round_times)
+        print(f"  {'Recommendations':<22} {found:9d}   per second: {found / total_time if total_time else 0:9.1f}   mean round: {total_time / max(1, len(round_times)) * 1000:.1f} ms")
+
+        to_add = [(show.name, show.year) for show in session.recommended_shows[: args.adds]]
+
+        def add_all():
+            data_handler.add_shows(session, to_add)
+            while data_handler.add_worker_running:
+                time.sleep(0.01)
+            data_handler.emit_buffer.flush()
+
+        measure(f"Add {len(to_add)} shows", upstream, counter, add_all)
+        outcomes = Counter(show.status for show in session.recommended_shows[: args.adds])
+        print(f"  {'Add outcomes':<22} " + ", ".join(f"{status}={count}" for status, count in sorted(outcomes.items())))
+        session.stop_event.set()
+
+    finally:
+        upstream.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every fake upstream response")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--adds", type=int, default=20)
+    args = parser.parse_args()
+
+    SonaShow.logging.getLogger().setLevel(SonaShow.logging.WARNING)
+    counter = FrameCounter()
+    SonaShow.socketio.emit = counter.emit
+    for size in [int(size) for size in args.sizes.split(",")]:
+        run_size(SonaShow.data_handler, counter, size, args)
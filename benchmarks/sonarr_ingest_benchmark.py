@@ -0,0 +1,94 @@
+"""Compare full-document and streaming parsing of a synthetic Sonarr /api/v3/series payload.
+
+Usage: python benchmarks/sonarr_ingest_benchmark.py [series_count]
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(tempfile.mkdtemp(prefix="sonashow-bench-"))
+
+import SonaShow  # noqa: E402
+from unidecode import unidecode  # noqa: E402
+
+
+def build_payload(series_count):
+    series = []
+    for i in range(series_count):
+        series.append(
+            {
+                "title": f"Synthetic Series {i} ({1990 + i % 35})",
+                "sortTitle": f"synthetic series {i}",
+                "status": "continuing",
+                "overview": "A synthetic overview used to pad the payload to a realistic size. " * 8,
+                "network": "Network",
+                "airTime": "21:00",
+                "images": [{"coverType": cover, "url": f"/MediaCover/{i}/{cover}.jpg", "remoteUrl": f"https://artworks.thetvdb.com/banners/{i}/{cover}.jpg"} for cover in ("banner", "poster", "fanart")],
+                "seasons": [
+                    {
+                        "seasonNumber": season,
+                        "monitored": True,
+                        "statistics": {"episodeFileCount": 10, "episodeCount": 10, "totalEpisodeCount": 10, "sizeOnDisk": 12345678901, "releaseGroups": ["GROUP"], "percentOfEpisodes": 100.0},
+                    }
+                    for season in range(1, 9)
+                ],
+                "year": 1990 + i % 35,
+                "path": f"/data/media/shows/Synthetic Series {i}",
+                "qualityProfileId": 1,
+                "seasonFolder": True,
+                "monitored": True,
+                "tvdbId": 100000 + i,
+                "tvRageId": 0,
+                "tvMazeId": 0,
+                "tmdbId": 200000 + i,
+                "firstAired": "2001-01-01T00:00:00Z",
+                "seriesType": "standard",
+                "cleanTitle": f"syntheticseries{i}",
+                "imdbId": f"tt{i:07d}",
+                "titleSlug": f"synthetic-series-{i}",
+                "genres": ["Drama", "Comedy"],
+                "tags": [],
+                "added": "2020-01-01T00:00:00Z",
+                "ratings": {"votes": 100, "value": 7.5},
+                "statistics": {"seasonCount": 8, "episodeFileCount": 80, "episodeCount": 80, "totalEpisodeCount": 80, "sizeOnDisk": 98765432100, "percentOfEpisodes": 100.0},
+                "id": i,
+            }
+        )
+    return json.dumps(series).encode("utf-8")
+
+
+def full_document_ingest(payload):
+    full_sonarr_show_list = json.loads(payload.decode("utf-8"))
+    sonarr_items = [{"name": re.sub(r" \(\d{4}\)", "", unidecode(show["title"], replace_str=" ")), "checked": False} for show in full_sonarr_show_list]
+    sonarr_items.sort(key=lambda x: x["name"].lower())
+    return full_sonarr_show_list, sonarr_items
+
+
+def streaming_ingest(payload):
+    chunks = (payload[i : i + 65536] for i in range(0, len(payload), 65536))
+    return SonaShow.data_handler.parse_sonarr_series(chunks)
+
+
+def measure(name, func, payload):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(payload)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<15} time: {elapsed:8.3f} s   peak: {peak / 1048576:8.1f} MiB   retained: {retained / 1048576:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    series_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    payload = build_payload(series_count)
+    print(f"Series: {series_count}   Payload: {len(payload) / 1048576:.1f} MiB")
+    measure("Full document", full_document_ingest, payload)
+    measure("Streaming", streaming_ingest, payload)
@@ -1,5 +1,7 @@
+import os
+
 bind = "0.0.0.0:5000"
-workers = 1
+workers = int(os.environ.get("gunicorn_workers") or 1)
 threads = 4
 timeout = 120
 worker_class = "geventwebsocket.gunicorn.workers.GeventWebSocketWorker"
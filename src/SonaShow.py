@@ -1,17 +1,1172 @@
 import json
 import time
+import codecs
+import contextlib
+import concurrent.futures
 import logging
 import os
 import random
+import sys
+import bisect
+import heapq
+import math
 import threading
+import _thread
 import urllib.parse
-from flask import Flask, render_template
-from flask_socketio import SocketIO
+import email.utils
+from collections import Counter, OrderedDict, deque
+from flask import Flask, Response, render_template, request, send_file, abort
+from flask_socketio import SocketIO, join_room
 import requests
-from thefuzz import fuzz
 from unidecode import unidecode
 import re
-from iso639 import Lang
+import sqlite3
+import hashlib
+import itertools
+from array import array
+
+
+class TMDBCache:
+    def __init__(self, db_path, ttls, max_entries):
+        self.db_path = db_path
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS tmdb_cache (endpoint TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (endpoint, key))")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tmdb_cache_accessed ON tmdb_cache (accessed)")
+        self.conn.commit()
+
+    def get(self, endpoint, key):
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT value, created FROM tmdb_cache WHERE endpoint = ? AND key = ?", (endpoint, str(key))).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created = row
+            if now - created > self.ttls.get(endpoint, 0):
+                self.conn.execute("DELETE FROM tmdb_cache WHERE endpoint = ? AND key = ?", (endpoint, str(key)))
+                self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE tmdb_cache SET accessed = ? WHERE endpoint = ? AND key = ?", (now, endpoint, str(key)))
+            self.conn.commit()
+            self.hits += 1
+            return json.loads(value)
+
+    def set(self, endpoint, key, value):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO tmdb_cache (endpoint, key, value, created, accessed) VALUES (?, ?, ?, ?, ?)", (endpoint, str(key), json.dumps(value), now, now))
+            count = self.conn.execute("SELECT COUNT(*) FROM tmdb_cache").fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute("DELETE FROM tmdb_cache WHERE rowid IN (SELECT rowid FROM tmdb_cache ORDER BY accessed ASC LIMIT ?)", (count - self.max_entries,))
+            self.conn.commit()
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM tmdb_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+class MemoryStateStore:
+    shared = False
+
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.time() >= expires:
+                del self.values[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.values[key] = (value, time.time() + ttl if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        with self.lock:
+            self.values.pop(key, None)
+
+
+class SQLiteStateStore:
+    shared = True
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS shared_state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)")
+        self.conn.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM shared_state WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO shared_state (key, value, expires) VALUES (?, ?, ?)", (key, json.dumps(value), time.time() + ttl if ttl else None))
+            self.conn.commit()
+
+    def add(self, key, value, ttl=None):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("DELETE FROM shared_state WHERE key = ? AND expires IS NOT NULL AND expires <= ?", (key, now))
+            cursor = self.conn.execute("INSERT OR IGNORE INTO shared_state (key, value, expires) VALUES (?, ?, ?)", (key, json.dumps(value), now + ttl if ttl else None))
+            self.conn.commit()
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        with self.lock:
+            self.conn.execute("DELETE FROM shared_state WHERE key = ?", (key,))
+            self.conn.commit()
+
+
+class RedisStateStore:
+    shared = True
+
+    def __init__(self, url, prefix="sonashow:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=int(ttl) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self.prefix + key, json.dumps(value), ex=int(ttl) if ttl else None, nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+def open_state_store(backend, config_folder):
+    if backend in ("", "memory"):
+        return MemoryStateStore()
+    if backend == "sqlite":
+        return SQLiteStateStore(os.path.join(config_folder, "shared_state.db"))
+    if backend.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStateStore(backend)
+    raise ValueError(f"Unknown state backend: {backend}")
+
+
+class RateLimiter:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, cancel_event=None):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                else:
+                    delay = (1 - self.tokens) / self.rate
+
+            if cancel_event is not None:
+                if cancel_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+
+    def block_for(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value, default=1.0):
+    # Retry-After is either a number of seconds or an HTTP date.
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+def normalize_title(title):
+    return " ".join(unidecode(title, replace_str=" ").lower().split())
+
+
+class TitleMatcher:
+    def __init__(self, titles, years=None, threshold=90):
+        self.titles = list(titles)
+        self.years = [str(year) for year in years] if years is not None else [""] * len(self.titles)
+        self.threshold = threshold
+        self.lowered = [title.lower() for title in self.titles]
+        self.decoded = [unidecode(title) for title in self.lowered]
+
+    def score(self, query, year="", score_cutoff=0):
+        query_with_year = f"{query.lower()} ({year})"
+        from rapidfuzz import fuzz, process
+
+        decoded_query = unidecode(query.lower())
+        with_year_scores = {index: score for _, score, index in process.extract(query_with_year, self.lowered, scorer=fuzz.ratio, limit=None, score_cutoff=score_cutoff)}
+        title_scores = {index: score for _, score, index in process.extract(decoded_query, self.decoded, scorer=fuzz.ratio, limit=None, score_cutoff=score_cutoff)}
+
+        breakdowns = []
+        for index in sorted(with_year_scores.keys() | title_scores.keys()):
+            title = self.titles[index]
+            year_match = bool(year) and str(year) == self.years[index]
+            title_with_year = round(with_year_scores.get(index, 0))
+            title_score = round(title_scores.get(index, 0))
+            breakdowns.append(
+                {
+                    "name": title,
+                    "index": index,
+                    "title_with_year": title_with_year,
+                    "title": title_score,
+                    "year_match": year_match,
+                    "score": max(title_with_year, title_score) + (5 if year_match else 0),
+                    "accepted": title_with_year > self.threshold or (title_score > self.threshold and year_match),
+                }
+            )
+        return breakdowns
+
+    def best_match(self, query, year=""):
+        accepted = [breakdown for breakdown in self.score(query, year, score_cutoff=self.threshold) if breakdown["accepted"]]
+        if not accepted:
+            return None
+        return max(accepted, key=lambda breakdown: (breakdown["score"], -breakdown["index"]))
+
+    def search(self, query, limit=10, score_cutoff=60):
+        from rapidfuzz import fuzz, process
+
+        results = process.extract(normalize_title(query), self.decoded, scorer=fuzz.WRatio, limit=limit, score_cutoff=score_cutoff)
+        return [(self.titles[index], round(score)) for _, score, index in results]
+
+
+class MetadataRegistry:
+    default_genres = {
+        10759: "Action & Adventure",
+        16: "Animation",
+        35: "Comedy",
+        80: "Crime",
+        99: "Documentary",
+        18: "Drama",
+        10751: "Family",
+        10762: "Kids",
+        9648: "Mystery",
+        10763: "News",
+        10764: "Reality",
+        10765: "Sci-Fi & Fantasy",
+        10766: "Soap",
+        10767: "Talk",
+        10768: "War & Politics",
+        37: "Western",
+    }
+
+    def __init__(self, path, logger, max_age=86400 * 7):
+        self.path = path
+        self.logger = logger
+        self.max_age = max_age
+        self.updated = 0.0
+        self.genres = dict(self.default_genres)
+        self.languages = {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as json_file:
+                    ret = json.load(json_file)
+                self.updated = ret.get("updated", 0.0)
+                self.genres.update({int(genre_id): name for genre_id, name in ret.get("genres", {}).items()})
+                self.languages.update(ret.get("languages", {}))
+        except Exception as e:
+            self.logger.error(f"Error Loading Metadata: {str(e)}")
+
+    def is_stale(self):
+        return time.time() - self.updated > self.max_age
+
+    def refresh(self, request_tmdb, base_url, api_key):
+        genre_data = request_tmdb(f"{base_url}/genre/tv/list", {"api_key": api_key})
+        language_data = request_tmdb(f"{base_url}/configuration/languages", {"api_key": api_key})
+        self.genres.update({genre["id"]: genre["name"] for genre in genre_data.get("genres", [])})
+        self.languages.update({language["iso_639_1"]: language["english_name"] for language in language_data if language.get("english_name")})
+        self.updated = time.time()
+        with open(self.path, "w") as json_file:
+            json.dump({"updated": self.updated, "genres": self.genres, "languages": self.languages}, json_file, indent=4)
+        self.logger.info(f"Loaded {len(self.genres)} genres and {len(self.languages)} languages from TheMovieDB")
+
+    def genre_names(self, genre_ids):
+        return [self.genres.get(genre_id, "Unknown") for genre_id in genre_ids]
+
+    def language_name(self, code):
+        name = self.languages.get(code)
+        if name is None:
+            from iso639 import Lang
+
+            try:
+                name = Lang(code).name
+            except Exception:
+                name = code
+            self.languages[code] = name
+        return name
+
+
+class PosterCache:
+    sizes = ("w92", "w154", "w185", "w342", "w500", "w780")
+
+    def __init__(self, folder, max_bytes, logger):
+        self.folder = os.path.abspath(folder)
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in self.iter_files())
+
+    def iter_files(self):
+        for size in os.scandir(self.folder):
+            if size.is_dir():
+                yield from (entry for entry in os.scandir(size.path) if entry.is_file())
+
+    def get(self, size, filename):
+        if size not in self.sizes or not re.fullmatch(r"[A-Za-z0-9_\-]+\.(jpg|jpeg|png)", filename):
+            return None
+
+        path = os.path.join(self.folder, size, filename)
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+
+        start = time.perf_counter()
+        response = self.session.get(f"https://image.tmdb.org/t/p/{size}/{filename}", timeout=30)
+        metrics.observe_response("tmdb_images", start, response)
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as image_file:
+            image_file.write(response.content)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(response.content)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        return path
+
+    def evict(self):
+        entries = sorted(self.iter_files(), key=lambda entry: entry.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self.total_bytes <= target:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            self.total_bytes -= size
+        self.logger.info(f"Poster cache trimmed to {self.total_bytes / 1048576:.1f} MB")
+
+
+class TVDBClient:
+    def __init__(self, api_key, logger, timeout=15, token_lifetime=86400 * 25, memo_size=1000):
+        self.base_url = "https://api4.thetvdb.com/v4"
+        self.api_key = api_key
+        self.logger = logger
+        self.timeout = timeout
+        self.token_lifetime = token_lifetime
+        self.memo_size = memo_size
+        self.session = requests.Session()
+        self.token = None
+        self.token_expiry = 0.0
+        self.search_memo = OrderedDict()
+        self.lock = threading.Lock()
+        self.token_lock = threading.Lock()
+
+    def set_api_key(self, api_key):
+        with self.token_lock, self.lock:
+            if api_key != self.api_key:
+                self.api_key = api_key
+                self.token = None
+                self.search_memo.clear()
+
+    def request_bearer_token(self):
+        login_url = f"{self.base_url}/login"
+        headers = {"Content-Type": "application/json"}
+        login_data = {"apikey": self.api_key}
+        start = time.perf_counter()
+        response = self.session.post(login_url, headers=headers, json=login_data, timeout=self.timeout)
+        metrics.observe_response("tvdb", start, response)
+        response.raise_for_status()
+        self.token = response.json()["data"]["token"]
+        self.token_expiry = time.time() + self.token_lifetime
+        self.logger.info("Obtained new TVDB bearer token")
+
+    def get_token(self, rejected=None):
+        # Logins hold their own lock so memo lookups are not blocked behind the HTTP round trip.
+        with self.token_lock:
+            if self.token is None or self.token == rejected or time.time() >= self.token_expiry:
+                self.request_bearer_token()
+            return self.token
+
+    def search(self, query):
+        memo_key = normalize_title(query)
+        with self.lock:
+            if memo_key in self.search_memo:
+                self.search_memo.move_to_end(memo_key)
+                return self.search_memo[memo_key]
+
+        tvdb_url = f"{self.base_url}/search"
+        params = {"query": query}
+        token = self.get_token()
+        start = time.perf_counter()
+        response = self.session.get(tvdb_url, headers={"Authorization": f"Bearer {token}"}, params=params, timeout=self.timeout)
+        metrics.observe_response("tvdb", start, response)
+        if response.status_code == 401:
+            self.logger.info("TVDB bearer token rejected, refreshing")
+            token = self.get_token(rejected=token)
+            start = time.perf_counter()
+            response = self.session.get(tvdb_url, headers={"Authorization": f"Bearer {token}"}, params=params, timeout=self.timeout)
+            metrics.observe_response("tvdb", start, response)
+        response.raise_for_status()
+        results = response.json().get("data", [])
+
+        with self.lock:
+            self.search_memo[memo_key] = results
+            if len(self.search_memo) > self.memo_size:
+                self.search_memo.popitem(last=False)
+        return results
+
+
+def iter_json_array(chunks):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    finished = False
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                finished = True
+                break
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            yield item
+        if finished:
+            return
+        buffer = buffer[pos:]
+
+    raise ValueError("Incomplete JSON array")
+
+
+class SonarrSeries:
+    __slots__ = ("name", "tmdb_id", "tvdb_id", "checked")
+
+    def __init__(self, name, tmdb_id=None, tvdb_id=None, checked=False):
+        self.name = name
+        self.tmdb_id = tmdb_id
+        self.tvdb_id = tvdb_id
+        self.checked = checked
+
+    @classmethod
+    def from_sonarr(cls, show, checked=False):
+        name = re.sub(r" \(\d{4}\)", "", unidecode(show["title"], replace_str=" "))
+        return cls(name, tmdb_id=int(show.get("tmdbId") or 0) or None, tvdb_id=int(show.get("tvdbId") or 0) or None, checked=checked)
+
+
+class LibraryIndex:
+    def __init__(self):
+        self.tmdb_ids = {}
+        self.tvdb_ids = {}
+        self.titles = {}
+        self.seed_tmdb_ids = {}
+        self.matcher = None
+        self.revision = 0
+
+    def clear(self):
+        self.tmdb_ids = {}
+        self.tvdb_ids = {}
+        self.titles = {}
+        self.seed_tmdb_ids = {}
+        self.matcher = None
+        self.revision += 1
+
+    def add(self, name, tmdb_id=None, tvdb_id=None):
+        if tmdb_id:
+            self.tmdb_ids[int(tmdb_id)] = name
+            self.seed_tmdb_ids[name] = int(tmdb_id)
+        if tvdb_id:
+            self.tvdb_ids[int(tvdb_id)] = name
+        self.titles.setdefault(normalize_title(name), []).append(name)
+        self.matcher = None
+        self.revision += 1
+
+    def remove(self, name, tmdb_id=None, tvdb_id=None):
+        self.tmdb_ids.pop(tmdb_id, None)
+        self.tvdb_ids.pop(tvdb_id, None)
+        self.seed_tmdb_ids.pop(name, None)
+        title = normalize_title(name)
+        names = self.titles.get(title, [])
+        if name in names:
+            names.remove(name)
+        if not names:
+            self.titles.pop(title, None)
+        self.matcher = None
+        self.revision += 1
+
+    def contains(self, tmdb_id=None, tvdb_id=None, title=None):
+        if tmdb_id and tmdb_id in self.tmdb_ids:
+            return True
+        if tvdb_id and tvdb_id in self.tvdb_ids:
+            return True
+        return title is not None and normalize_title(title) in self.titles
+
+    def tmdb_id_for(self, name):
+        return self.seed_tmdb_ids.get(name)
+
+    def search_names(self, query, limit=100):
+        query = normalize_title(query)
+        if self.matcher is None:
+            self.matcher = TitleMatcher(list(self.titles))
+        titles = sorted(title for title in self.titles if title.startswith(query) or f" {query}" in title)
+        prefix_matches = set(titles)
+        titles += [title for title, _ in self.matcher.search(query, limit) if title not in prefix_matches]
+        return [name for title in titles for name in self.titles[title]]
+
+
+class EmitBuffer:
+    def __init__(self, max_items=20, max_delay=0.05):
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.pending = OrderedDict()
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def push(self, event, item, key=None, to=None):
+        batch = None
+        with self.lock:
+            items = self.pending.setdefault((event, to), OrderedDict())
+            items[key if key is not None else len(items)] = item
+            if len(items) >= self.max_items:
+                batch = self.pending.pop((event, to))
+            elif self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+        if batch:
+            socketio.emit(event, list(batch.values()), to=to)
+
+    def flush(self):
+        with self.lock:
+            pending = self.pending
+            self.pending = OrderedDict()
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+        for (event, to), items in pending.items():
+            socketio.emit(event, list(items.values()), to=to)
+
+
+class Recommendation:
+    __slots__ = ("id", "name", "year", "genre", "status", "poster", "vote_average", "vote_count", "popularity", "base_shows")
+    fields = __slots__
+
+    def __init__(self, id, name, year, genre, status="", poster="", vote_average=0.0, vote_count=0, popularity=0.0, base_shows=None):
+        self.id = id
+        self.name = name
+        self.year = year
+        self.genre = genre
+        self.status = status
+        self.poster = poster
+        self.vote_average = vote_average
+        self.vote_count = vote_count
+        self.popularity = popularity
+        self.base_shows = base_shows if base_shows is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+    def copy(self):
+        return Recommendation(**{**self.to_dict(), "base_shows": list(self.base_shows)})
+
+    def card(self):
+        return {"Id": self.id, "Name": self.name, "Year": self.year, "Genre": self.genre, "Status": self.status, "Poster": self.poster, "Votes": self.vote_count, "Rating": self.vote_average}
+
+    def details(self, overview, language):
+        return {"Id": self.id, "Name": self.name, "Overview": overview, "Language": language, "Popularity": self.popularity, "Base_Show": ", ".join(self.base_shows)}
+
+
+class RecommendationPool:
+    multiplicity_weight = 0.25
+    popularity_weight = 0.1
+
+    def __init__(self, capacity=200, prior_votes=50, prior_rating=7.0):
+        self.capacity = capacity
+        self.prior_votes = prior_votes
+        self.prior_rating = prior_rating
+        self.slots = {}
+        self.shows = []
+        self.free_slots = []
+        self.vote_average = array("d")
+        self.vote_count = array("d")
+        self.popularity = array("d")
+        self.multiplicity = array("I")
+        self.scores = array("d")
+        self.lowest = []
+        self.highest = []
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, show_id):
+        return show_id in self.slots
+
+    def __iter__(self):
+        return (self.shows[slot] for slot in self.slots.values())
+
+    def copy(self):
+        pool = RecommendationPool(self.capacity, self.prior_votes, self.prior_rating)
+        for show_id, slot in self.slots.items():
+            pool.add(show_id, self.shows[slot].copy(), self.vote_average[slot], self.vote_count[slot], self.popularity[slot], self.multiplicity[slot])
+        return pool
+
+    def score(self, vote_average, vote_count, popularity, multiplicity):
+        bayesian_rating = (vote_count * vote_average + self.prior_votes * self.prior_rating) / (vote_count + self.prior_votes)
+        return bayesian_rating / 10 + self.multiplicity_weight * math.log2(multiplicity) + self.popularity_weight * popularity / (popularity + 50)
+
+    def push(self, slot, show_id):
+        score = self.scores[slot]
+        heapq.heappush(self.lowest, (score, slot, show_id))
+        heapq.heappush(self.highest, (-score, slot, show_id))
+        if max(len(self.lowest), len(self.highest)) > 4 * len(self.slots) + 64:
+            self.rebuild_heaps()
+
+    def is_current(self, score, slot, show_id):
+        return self.slots.get(show_id) == slot and self.scores[slot] == score
+
+    def rebuild_heaps(self):
+        self.lowest = [(self.scores[slot], slot, show_id) for show_id, slot in self.slots.items()]
+        self.highest = [(-score, slot, show_id) for score, slot, show_id in self.lowest]
+        heapq.heapify(self.lowest)
+        heapq.heapify(self.highest)
+
+    def get(self, show_id):
+        slot = self.slots.get(show_id)
+        return self.shows[slot] if slot is not None else None
+
+    def bump(self, show_id, multiplicity=1):
+        slot = self.slots[show_id]
+        self.multiplicity[slot] += multiplicity
+        self.scores[slot] = self.score(self.vote_average[slot], self.vote_count[slot], self.popularity[slot], self.multiplicity[slot])
+        self.push(slot, show_id)
+
+    def add(self, show_id, show, vote_average, vote_count, popularity, multiplicity=1):
+        if show_id in self.slots:
+            self.bump(show_id, multiplicity)
+            return False
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.shows[slot] = show
+            self.vote_average[slot] = vote_average
+            self.vote_count[slot] = vote_count
+            self.popularity[slot] = popularity
+            self.multiplicity[slot] = multiplicity
+            self.scores[slot] = 0.0
+        else:
+            slot = len(self.shows)
+            self.shows.append(show)
+            self.vote_average.append(vote_average)
+            self.vote_count.append(vote_count)
+            self.popularity.append(popularity)
+            self.multiplicity.append(multiplicity)
+            self.scores.append(0.0)
+        self.slots[show_id] = slot
+        self.scores[slot] = self.score(vote_average, vote_count, popularity, multiplicity)
+        self.push(slot, show_id)
+
+        while len(self.slots) > self.capacity:
+            score, lowest_slot, lowest_id = heapq.heappop(self.lowest)
+            if self.is_current(score, lowest_slot, lowest_id):
+                self.release(lowest_id, lowest_slot)
+        return True
+
+    def release(self, show_id, slot):
+        del self.slots[show_id]
+        self.shows[slot] = None
+        self.free_slots.append(slot)
+
+    def pop_best(self):
+        while self.highest:
+            negative_score, slot, show_id = heapq.heappop(self.highest)
+            if self.is_current(-negative_score, slot, show_id):
+                show = self.shows[slot]
+                self.release(show_id, slot)
+                return show
+        return None
+
+    def rescore(self, prior_votes=None, minimum_rating=None, minimum_votes=None):
+        if prior_votes is not None:
+            self.prior_votes = max(1, prior_votes)
+        live = list(self.slots.items())
+        if live:
+            self.prior_rating = sum(self.vote_average[slot] for _, slot in live) / len(live)
+        for show_id, slot in live:
+            if (minimum_rating is not None and self.vote_average[slot] < minimum_rating) or (minimum_votes is not None and self.vote_count[slot] < minimum_votes):
+                self.release(show_id, slot)
+        self.scores = array("d", map(self.score, self.vote_average, self.vote_count, self.popularity, self.multiplicity))
+        self.rebuild_heaps()
+
+
+class SeedScheduler:
+    exploration = 0.5
+    explore_share = 0.3
+
+    def __init__(self, path, logger, state_store, save_interval=30):
+        self.path = path
+        self.logger = logger
+        self.state_store = state_store
+        self.save_interval = save_interval
+        self.stats = {}
+        self.total_pulls = 0
+        self.pending = {}
+        self.pending_pulls = 0
+        self.last_save = 0.0
+        self.lock = threading.Lock()
+        try:
+            ret = self.read_stats()
+            if ret is not None:
+                self.total_pulls = ret["total_pulls"]
+                self.stats = ret["seeds"]
+        except Exception as e:
+            self.logger.error(f"Error Loading Seed Stats: {str(e)}")
+
+    def read_stats(self):
+        ret = self.state_store.get("seed_stats") if self.state_store.shared else None
+        if ret is None and os.path.exists(self.path):
+            with open(self.path, "r") as json_file:
+                ret = json.load(json_file)
+        if ret is None:
+            return None
+        return {"total_pulls": ret.get("total_pulls", 0), "seeds": {key: [entry[0], entry[1]] for key, entry in ret.get("seeds", {}).items()}}
+
+    def write_stats(self, data):
+        if self.state_store.shared:
+            self.state_store.set("seed_stats", data)
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as json_file:
+            json.dump(data, json_file)
+        os.replace(temp_path, self.path)
+
+    def priority(self, seed):
+        entry = self.stats.get(normalize_title(seed))
+        if entry is None or entry[0] == 0:
+            return None
+        pulls, reward = entry
+        return reward / pulls + self.exploration * math.sqrt(math.log(self.total_pulls + 1) / pulls)
+
+    def select(self, session, count):
+        available = [seed for seed in session.seeds if seed not in session.exhausted_seeds]
+        fresh = [seed for seed in available if seed not in session.pulled_seeds]
+        if not fresh:
+            session.pulled_seeds.clear()
+            fresh = available
+        scored = []
+        unseen = []
+        for seed in fresh:
+            priority = self.priority(seed)
+            if priority is None:
+                unseen.append(seed)
+            else:
+                scored.append((priority, random.random(), seed))
+        # Unseen seeds get a fixed share of each round so a large library cannot crowd out the seeds known to be productive.
+        explore = min(len(unseen), max(1, int(count * self.explore_share)), count)
+        best = [seed for _, _, seed in heapq.nlargest(count - explore, scored)]
+        selected = best + random.sample(unseen, min(len(unseen), count - len(best)))
+        session.pulled_seeds.update(selected)
+        return selected
+
+    def record(self, seed, reward):
+        key = normalize_title(seed)
+        with self.lock:
+            for table in (self.stats, self.pending):
+                entry = table.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += reward
+            self.total_pulls += 1
+            self.pending_pulls += 1
+
+    def restore_pending(self, pending, pending_pulls):
+        with self.lock:
+            for key, (pulls, reward) in pending.items():
+                entry = self.pending.setdefault(key, [0, 0.0])
+                entry[0] += pulls
+                entry[1] += reward
+            self.pending_pulls += pending_pulls
+
+    def save(self, force=False):
+        with self.lock:
+            if not force and (not self.pending or time.time() - self.last_save < self.save_interval):
+                return
+            pending, pending_pulls = self.pending, self.pending_pulls
+            self.pending = {}
+            self.pending_pulls = 0
+            self.last_save = time.time()
+
+        # Only this process's new pulls are merged into the stored totals, so several workers add up instead of overwriting each other.
+        if self.state_store.shared and not self.state_store.add("lease:seed_stats", os.getpid(), ttl=10):
+            self.restore_pending(pending, pending_pulls)
+            return
+        try:
+            data = self.read_stats() or {"total_pulls": 0, "seeds": {}}
+            for key, (pulls, reward) in pending.items():
+                entry = data["seeds"].setdefault(key, [0, 0.0])
+                entry[0] += pulls
+                entry[1] += reward
+            data["total_pulls"] += pending_pulls
+            if pending:
+                self.write_stats(data)
+        except Exception as e:
+            self.logger.error(f"Error Saving Seed Stats: {str(e)}")
+            self.restore_pending(pending, pending_pulls)
+            return
+        finally:
+            if self.state_store.shared:
+                self.state_store.delete("lease:seed_stats")
+
+        with self.lock:
+            for key, (pulls, reward) in self.pending.items():
+                entry = data["seeds"].setdefault(key, [0, 0.0])
+                entry[0] += pulls
+                entry[1] += reward
+            self.stats = data["seeds"]
+            self.total_pulls = data["total_pulls"] + self.pending_pulls
+
+
+class SeedCursor:
+    __slots__ = ("tv_show_id", "endpoints", "endpoint_index", "page", "total_pages")
+
+    def __init__(self, endpoints):
+        self.tv_show_id = None
+        self.endpoints = endpoints
+        self.endpoint_index = 0
+        self.page = 1
+        self.total_pages = 1
+
+    @property
+    def endpoint(self):
+        return self.endpoints[self.endpoint_index]
+
+    def exhausted(self):
+        return self.endpoint_index >= len(self.endpoints)
+
+    def advance(self, total_pages):
+        self.total_pages = total_pages
+        self.page += 1
+        if self.page > self.total_pages:
+            self.endpoint_index += 1
+            self.page = 1
+            self.total_pages = 1
+
+    def finish(self):
+        self.endpoint_index = len(self.endpoints)
+
+
+class ClientSession:
+    history_limit = 1000
+
+    def __init__(self, client_id, seeds=None):
+        self.client_id = client_id
+        self.seeds = []
+        self.seed_cursors = {}
+        self.pulled_seeds = set()
+        self.exhausted_seeds = set()
+        self.recommended_shows = []
+        self.recommended_show_ids = set()
+        self.ready_shows = RecommendationPool()
+        self.selected = None
+        self.sidebar_filter = None
+        self.demand = 0
+        self.new_found_shows_counter = 0
+        self.round_stats = Counter()
+        self.search_in_progress_flag = False
+        self.last_exhausted_toast = 0.0
+        self.last_page_request = 0.0
+        self.stop_event = threading.Event()
+        self.stop_event.set()
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.last_seen = time.time()
+        self.reset(seeds or [])
+
+    def reset(self, seeds, demand=0):
+        self.seeds = list(seeds)
+        random.shuffle(self.seeds)
+        self.seed_cursors = {}
+        self.pulled_seeds = set()
+        self.exhausted_seeds = set()
+        self.recommended_shows = []
+        self.recommended_show_ids = set()
+        self.ready_shows = RecommendationPool(self.ready_shows.capacity, self.ready_shows.prior_votes)
+        self.demand = demand
+        self.new_found_shows_counter = 1
+
+    def has_available_seeds(self):
+        return any(seed not in self.exhausted_seeds for seed in self.seeds)
+
+    def is_running(self):
+        return not self.stop_event.is_set()
+
+
+class Metrics:
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    descriptions = {
+        "sonashow_upstream_request_duration_seconds": ("histogram", "Latency of upstream HTTP requests."),
+        "sonashow_upstream_responses_total": ("counter", "Upstream HTTP responses by status code."),
+        "sonashow_round_duration_seconds": ("histogram", "Duration of find_similar_shows rounds."),
+        "sonashow_rounds_total": ("counter", "Completed find_similar_shows rounds by result."),
+        "sonashow_round_candidates_total": ("counter", "Recommendation candidates by stage."),
+        "sonashow_active_workers": ("gauge", "Worker threads currently running by kind."),
+        "sonashow_workers_started_total": ("counter", "Worker threads started by kind."),
+        "sonashow_jobs_queued": ("gauge", "Scheduled jobs waiting for a free worker by kind."),
+        "sonashow_jobs_total": ("counter", "Finished scheduled jobs by kind and status."),
+        "sonashow_socketio_emits_total": ("counter", "Socket.IO emits by event."),
+        "sonashow_socketio_emit_bytes_total": ("counter", "Estimated Socket.IO payload bytes by event, sampled from one in 16 emits."),
+        "sonashow_connected_clients": ("gauge", "Connected Socket.IO clients."),
+        "sonashow_sessions": ("gauge", "Client sessions held in memory."),
+        "sonashow_library_shows": ("gauge", "Shows in the Sonarr library index."),
+        "sonashow_tmdb_cache_requests_total": ("counter", "TMDB cache lookups by result."),
+        "sonashow_tmdb_cache_entries": ("gauge", "Entries in the TMDB cache."),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index in range(bisect.bisect_left(self.buckets, value), len(self.buckets)):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def observe_response(self, upstream, start, response):
+        self.observe("sonashow_upstream_request_duration_seconds", time.perf_counter() - start, upstream=upstream)
+        self.inc("sonashow_upstream_responses_total", upstream=upstream, code=str(response.status_code))
+
+    @contextlib.contextmanager
+    def track_worker(self, kind):
+        self.inc("sonashow_workers_started_total", kind=kind)
+        self.inc("sonashow_active_workers", kind=kind)
+        try:
+            yield
+        finally:
+            self.inc("sonashow_active_workers", -1, kind=kind)
+
+    def format_labels(self, labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{str(value)}"' for key, value in pairs) + "}"
+
+    def render(self):
+        with self.lock:
+            values = dict(self.values)
+            histograms = {key: (list(data[0]), data[1], data[2]) for key, data in self.histograms.items()}
+
+        lines = []
+        for name, (kind, description) in self.descriptions.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        lines.append(f"{name}_bucket{self.format_labels(labels, [('le', bound)])} {bucket_count}")
+                    lines.append(f"{name}_bucket{self.format_labels(labels, [('le', '+Inf')])} {count}")
+                    lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+            else:
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self.format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    def __init__(self, logger, interval=0.005, thread_prefixes=("Search_Job",)):
+        self.logger = logger
+        self.interval = interval
+        self.thread_prefixes = thread_prefixes
+        self.samples = Counter()
+        self.sample_count = 0
+        self.running = False
+        self.finished = None
+        self.target_ident = None
+        self.hub_ident = None
+        self.sleep = time.sleep
+
+    def start(self):
+        self.target_ident = threading.get_ident()
+        monkey = sys.modules.get("gevent.monkey")
+        if monkey is not None and monkey.is_module_patched("threading"):
+            # Under gevent the search workers are greenlets sharing one OS thread, so a real thread samples whatever greenlet that thread is running.
+            self.hub_ident = monkey.get_original("_thread", "get_ident")()
+            self.sleep = monkey.get_original("time", "sleep")
+            start_new_thread, allocate_lock = monkey.get_original("_thread", ["start_new_thread", "allocate_lock"])
+        else:
+            start_new_thread, allocate_lock = _thread.start_new_thread, _thread.allocate_lock
+        self.finished = allocate_lock()
+        self.finished.acquire()
+        self.running = True
+        start_new_thread(self.run, ())
+
+    def run(self):
+        try:
+            while self.running:
+                self.sleep(self.interval)
+                frames = sys._current_frames()
+                if self.hub_ident is not None:
+                    idents = {self.hub_ident}
+                else:
+                    idents = {self.target_ident} | {thread.ident for thread in threading.enumerate() if thread.name.startswith(self.thread_prefixes)}
+                for ident, frame in frames.items():
+                    if ident in idents:
+                        self.samples[f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"] += 1
+                        self.sample_count += 1
+        finally:
+            self.finished.release()
+
+    def stop(self, top=15):
+        self.running = False
+        self.finished.acquire()
+        if not self.sample_count:
+            return
+        self.logger.info(f"Profile of find_similar_shows - {self.sample_count} samples:")
+        for location, count in self.samples.most_common(top):
+            self.logger.info(f"{count:6d}  {count / self.sample_count * 100:5.1f}%  {location}")
+
+
+class JobScheduler:
+    def __init__(self, limits, logger, on_status=None, default_limit=2):
+        self.limits = limits
+        self.logger = logger
+        self.on_status = on_status
+        self.default_limit = default_limit
+        self.executors = {}
+        self.active_keys = set()
+        self.job_ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def pool(self, kind):
+        with self.lock:
+            executor = self.executors.get(kind)
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.limits.get(kind, self.default_limit), thread_name_prefix=f"{kind.title()}_Job")
+                self.executors[kind] = executor
+            return executor
+
+    def submit(self, kind, target, *args, key=None, cancel_event=None, context=None):
+        with self.lock:
+            if key is not None:
+                if key in self.active_keys:
+                    return None
+                self.active_keys.add(key)
+            job_id = f"{kind}-{next(self.job_ids)}"
+        executor = self.pool(kind)
+
+        metrics.inc("sonashow_jobs_queued", kind=kind)
+        self.report(context, job_id, kind, "Queued")
+        executor.submit(self.run, job_id, kind, key, target, args, cancel_event, context)
+        return job_id
+
+    def run(self, job_id, kind, key, target, args, cancel_event, context):
+        metrics.inc("sonashow_jobs_queued", -1, kind=kind)
+        status = "Done"
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                status = "Cancelled"
+                return
+            self.report(context, job_id, kind, "Running")
+            with metrics.track_worker(kind):
+                target(*args)
+            if cancel_event is not None and cancel_event.is_set():
+                status = "Cancelled"
+
+        except Exception as e:
+            status = "Failed"
+            self.logger.error(f"{kind.title()} Job Error: {str(e)}")
+
+        finally:
+            with self.lock:
+                self.active_keys.discard(key)
+            metrics.inc("sonashow_jobs_total", kind=kind, status=status.lower())
+            self.report(context, job_id, kind, status)
+
+    def report(self, context, job_id, kind, status):
+        if self.on_status is not None:
+            self.on_status(context, {"Id": job_id, "Type": kind, "Status": status})
 
 
 class DataHandler:
@@ -25,18 +1180,53 @@ class DataHandler:
         self.sonashow_logger.warning(f"{app_name} Version: {release_version}\n")
         self.sonashow_logger.warning(f"{'*' * 50}")
 
-        self.search_in_progress_flag = False
-        self.new_found_shows_counter = 0
-        self.clients_connected_counter = 0
         self.config_folder = "config"
-        self.recommended_shows = []
+        self.tmdb_base_url = "https://api.themoviedb.org/3"
+        self.sessions = {}
+        self.session_client_ids = {}
+        self.template_session = None
         self.sonarr_items = []
-        self.cleaned_sonarr_items = []
-        self.stop_event = threading.Event()
-        self.stop_event.set()
+        self.library_index = LibraryIndex()
         if not os.path.exists(self.config_folder):
             os.makedirs(self.config_folder)
         self.load_environ_or_config_settings()
+        self.state_store = open_state_store(self.state_backend, self.config_folder)
+        self.library_version = None
+        self.tmdb_cache = TMDBCache(
+            os.path.join(self.config_folder, "tmdb_cache.db"),
+            ttls={
+                "search": self.tmdb_search_cache_ttl_hours * 3600,
+                "recommendations": self.tmdb_recommendations_cache_ttl_hours * 3600,
+                "similar": self.tmdb_recommendations_cache_ttl_hours * 3600,
+            },
+            max_entries=self.tmdb_cache_max_entries,
+        )
+        self.tmdb_session = requests.Session()
+        self.tmdb_rate_limiter = RateLimiter(self.tmdb_requests_per_second)
+        self.tvdb_client = TVDBClient(self.tvdb_api_key, self.sonashow_logger, timeout=self.upstream_request_timeout)
+        self.tvdb_id_memo = OrderedDict()
+        self.tvdb_id_memo_lock = threading.Lock()
+        self.overview_cache = OrderedDict()
+        self.overview_cache_lock = threading.Lock()
+        self.add_queue = deque()
+        self.pending_adds = set()
+        self.add_worker_running = False
+        self.add_queue_lock = threading.Lock()
+        self.emit_buffer = EmitBuffer()
+        self.job_scheduler = JobScheduler({"sonarr": 1, "adder": 2, "prefetch": 4, "search": max(1, self.search_workers), "tvdb": 4}, self.sonashow_logger, on_status=self.report_job_status)
+        self.poster_cache = PosterCache(os.path.join(self.config_folder, "posters"), self.poster_cache_max_mb * 1048576, self.sonashow_logger)
+        self.seed_scheduler = SeedScheduler(os.path.join(self.config_folder, "seed_stats.json"), self.sonashow_logger, self.state_store)
+        self.metadata_registry = MetadataRegistry(os.path.join(self.config_folder, "tmdb_metadata.json"), self.sonashow_logger)
+        if self.tmdb_api_key and self.metadata_registry.is_stale():
+            metadata_thread = threading.Thread(target=self.refresh_metadata, name="Metadata_Thread")
+            metadata_thread.daemon = True
+            metadata_thread.start()
+        self.shows_per_page = 20
+        self.delivery_wait_seconds = 1.0
+        if self.sonarr_sync_interval > 0:
+            sync_thread = threading.Thread(target=self.sonarr_sync_loop, name="Sonarr_Sync_Thread")
+            sync_thread.daemon = True
+            sync_thread.start()
         if self.auto_start:
             try:
                 auto_start_thread = threading.Timer(self.auto_start_delay, self.automated_startup)
@@ -65,6 +1255,20 @@ class DataHandler:
             "language_choice": "all",
             "auto_start": False,
             "auto_start_delay": 60,
+            "tmdb_search_cache_ttl_hours": 168.0,
+            "tmdb_recommendations_cache_ttl_hours": 24.0,
+            "tmdb_cache_max_entries": 20000,
+            "search_workers": 4,
+            "tmdb_requests_per_second": 40.0,
+            "sonarr_sync_interval": 60.0,
+            "session_idle_timeout": 30.0,
+            "prefetch_buffer_size": 40,
+            "include_similar_shows": False,
+            "poster_cache_max_mb": 500,
+            "profile_similar_shows": False,
+            "upstream_request_timeout": 15.0,
+            "state_backend": "memory",
+            "recommendation_pool_size": 200,
         }
 
         # Load settings from environmental variables (which take precedence) over the configuration file.
@@ -94,6 +1298,33 @@ class DataHandler:
         self.auto_start = auto_start.lower() == "true" if auto_start != "" else ""
         auto_start_delay = os.environ.get("auto_start_delay", "")
         self.auto_start_delay = float(auto_start_delay) if auto_start_delay else ""
+        tmdb_search_cache_ttl_hours = os.environ.get("tmdb_search_cache_ttl_hours", "")
+        self.tmdb_search_cache_ttl_hours = float(tmdb_search_cache_ttl_hours) if tmdb_search_cache_ttl_hours else ""
+        tmdb_recommendations_cache_ttl_hours = os.environ.get("tmdb_recommendations_cache_ttl_hours", "")
+        self.tmdb_recommendations_cache_ttl_hours = float(tmdb_recommendations_cache_ttl_hours) if tmdb_recommendations_cache_ttl_hours else ""
+        tmdb_cache_max_entries = os.environ.get("tmdb_cache_max_entries", "")
+        self.tmdb_cache_max_entries = int(tmdb_cache_max_entries) if tmdb_cache_max_entries else ""
+        search_workers = os.environ.get("search_workers", "")
+        self.search_workers = int(search_workers) if search_workers else ""
+        tmdb_requests_per_second = os.environ.get("tmdb_requests_per_second", "")
+        self.tmdb_requests_per_second = float(tmdb_requests_per_second) if tmdb_requests_per_second else ""
+        sonarr_sync_interval = os.environ.get("sonarr_sync_interval", "")
+        self.sonarr_sync_interval = float(sonarr_sync_interval) if sonarr_sync_interval else ""
+        session_idle_timeout = os.environ.get("session_idle_timeout", "")
+        self.session_idle_timeout = float(session_idle_timeout) if session_idle_timeout else ""
+        prefetch_buffer_size = os.environ.get("prefetch_buffer_size", "")
+        self.prefetch_buffer_size = int(prefetch_buffer_size) if prefetch_buffer_size else ""
+        include_similar_shows = os.environ.get("include_similar_shows", "")
+        self.include_similar_shows = include_similar_shows.lower() == "true" if include_similar_shows != "" else ""
+        poster_cache_max_mb = os.environ.get("poster_cache_max_mb", "")
+        self.poster_cache_max_mb = float(poster_cache_max_mb) if poster_cache_max_mb else ""
+        profile_similar_shows = os.environ.get("profile_similar_shows", "")
+        self.profile_similar_shows = profile_similar_shows.lower() == "true" if profile_similar_shows != "" else ""
+        upstream_request_timeout = os.environ.get("upstream_request_timeout", "")
+        self.upstream_request_timeout = float(upstream_request_timeout) if upstream_request_timeout else ""
+        self.state_backend = os.environ.get("state_backend", "")
+        recommendation_pool_size = os.environ.get("recommendation_pool_size", "")
+        self.recommendation_pool_size = int(recommendation_pool_size) if recommendation_pool_size else ""
 
         # Load variables from the configuration file if not set by environmental variables.
         try:
@@ -117,100 +1348,440 @@ class DataHandler:
         self.save_config_to_file()
 
     def automated_startup(self):
+        if not self.state_store.add("lease:auto_start", os.getpid(), ttl=self.auto_start_delay + 60):
+            self.sonashow_logger.info("Auto Start already handled by another worker")
+            return
         self.request_shows_from_sonarr(checked=True)
-        items = [x["name"] for x in self.sonarr_items]
-        self.start(items)
-
-    def connection(self):
-        if self.recommended_shows:
-            if self.clients_connected_counter == 0:
-                if len(self.recommended_shows) > 25:
-                    self.recommended_shows = random.sample(self.recommended_shows, 25)
-                else:
-                    self.sonashow_logger.info(f"Shuffling Shows")
-                    random.shuffle(self.recommended_shows)
-            socketio.emit("more_shows_loaded", self.recommended_shows)
-
-        self.clients_connected_counter += 1
+        items = [x.name for x in self.sonarr_items]
+        self.start(ClientSession(None), items)
+
+    def session_selection(self, session):
+        if session.selected is None:
+            session.selected = {item.name for item in self.sonarr_items if item.checked}
+        return session.selected
+
+    def filter_sonarr_names(self, session, query):
+        query = normalize_title(query or "")
+        revision = self.library_index.revision
+        if session.sidebar_filter is not None and session.sidebar_filter[:2] == (query, revision):
+            return session.sidebar_filter[2]
+
+        names = self.library_index.search_names(query) if query else [item.name for item in self.sonarr_items]
+        session.sidebar_filter = (query, revision, names)
+        return names
+
+    def sidebar_selection(self, session, names):
+        selected = self.session_selection(session)
+        return {"Selected": len(selected), "All_Selected": bool(names) and all(name in selected for name in names)}
+
+    def sidebar_summary(self, session, status="Success", code=None):
+        return {"Status": status, "Code": code, "Total": len(self.sonarr_items), "Running": session.is_running()}
+
+    def sidebar_page(self, session, data):
+        self.sync_library_from_store()
+        names = self.filter_sonarr_names(session, data.get("Query"))
+        offset = max(0, int(data.get("Offset", 0)))
+        limit = min(max(1, int(data.get("Limit", 100))), 500)
+        selected = self.session_selection(session)
+        ret = {"Query": data.get("Query", ""), "Offset": offset, "Total": len(names), "Items": [{"name": name, "checked": name in selected} for name in names[offset : offset + limit]], "Running": session.is_running()}
+        ret.update(self.sidebar_selection(session, names))
+        return ret
+
+    def sidebar_select(self, session, data):
+        selected = self.session_selection(session)
+        names = self.filter_sonarr_names(session, data.get("Query"))
+        if "All" in data:
+            changed = names
+            checked = data["All"]
+        else:
+            changed = data.get("Names", [])
+            checked = data.get("Checked", False)
+        if checked:
+            selected.update(changed)
+        else:
+            selected.difference_update(changed)
+        self.save_session(session)
+        return self.sidebar_selection(session, names)
+
+    def get_session(self, sid):
+        return self.sessions.get(self.session_client_ids.get(sid))
+
+    def emit_to_session(self, session, event, item, key=None):
+        if session.client_id is not None:
+            self.emit_buffer.push(event, item, key=key, to=session.client_id)
+
+    def evict_idle_sessions(self):
+        now = time.time()
+        for client_id, session in list(self.sessions.items()):
+            if session.connections == 0 and now - session.last_seen > self.session_idle_timeout * 60:
+                session.stop_event.set()
+                del self.sessions[client_id]
+                if self.template_session is session:
+                    self.template_session = None
+                self.sonashow_logger.info(f"Evicted idle session: {client_id}")
+
+    def publish_library(self):
+        if not self.state_store.shared:
+            return
+        version = f"{time.time()}:{os.getpid()}"
+        items = [[item.name, item.tmdb_id, item.tvdb_id, item.checked] for item in self.sonarr_items]
+        self.state_store.set("library", {"Version": version, "Items": items})
+        self.state_store.set("library_version", version)
+        self.library_version = version
+
+    def sync_library_from_store(self):
+        if not self.state_store.shared or self.state_store.get("library_version") in (None, self.library_version):
+            return
+        library = self.state_store.get("library")
+        if library is None:
+            return
+        self.sonarr_items = [SonarrSeries(name, tmdb_id=tmdb_id, tvdb_id=tvdb_id, checked=checked) for name, tmdb_id, tvdb_id, checked in library["Items"]]
+        self.library_index.clear()
+        for item in self.sonarr_items:
+            self.library_index.add(item.name, tmdb_id=item.tmdb_id, tvdb_id=item.tvdb_id)
+        self.library_version = library["Version"]
+
+    def save_session(self, session):
+        if not self.state_store.shared or session.client_id is None:
+            return
+        snapshot = {"Seeds": session.seeds, "Recommended": [show.to_dict() for show in session.recommended_shows[-100:]], "Selected": sorted(session.selected) if session.selected is not None else None}
+        self.state_store.set(f"session:{session.client_id}", snapshot, ttl=self.session_idle_timeout * 60)
 
-    def disconnection(self):
-        self.clients_connected_counter = max(0, self.clients_connected_counter - 1)
+    def save_running_flag(self, session):
+        if self.state_store.shared and session.client_id is not None:
+            self.state_store.set(f"running:{session.client_id}", session.is_running(), ttl=self.session_idle_timeout * 60)
 
-    def start(self, data):
+    def load_session(self, client_id):
+        if not self.state_store.shared or client_id is None:
+            return None
+        snapshot = self.state_store.get(f"session:{client_id}")
+        if snapshot is None:
+            return None
+        session = ClientSession(client_id, snapshot["Seeds"])
+        session.recommended_shows = [Recommendation.from_dict(show) for show in snapshot["Recommended"]]
+        if snapshot.get("Selected") is not None:
+            session.selected = set(snapshot["Selected"])
+        if self.state_store.get(f"running:{client_id}"):
+            session.stop_event.clear()
+        return session
+
+    def is_stopped_elsewhere(self, session):
+        return self.state_store.shared and session.client_id is not None and self.state_store.get(f"running:{session.client_id}") is False
+
+    def connection(self, sid, auth):
+        self.evict_idle_sessions()
+        self.sync_library_from_store()
+        client_id = (auth or {}).get("client_id") or sid
+        session = self.sessions.get(client_id) or self.load_session(client_id)
+        if session is None:
+            session = ClientSession(client_id)
+            template = self.template_session or self.load_session(self.state_store.get("template"))
+            if template is not None:
+                # The template's search round may still be filling these, so they are copied under its lock.
+                with template.lock:
+                    session.reset(template.seeds)
+                    session.recommended_shows = list(template.recommended_shows)
+                    session.ready_shows = template.ready_shows.copy()
+                if template.is_running():
+                    session.stop_event.clear()
+            self.sessions[client_id] = session
+
+        self.session_client_ids[sid] = client_id
+        metrics.set("sonashow_connected_clients", len(self.session_client_ids))
+        join_room(client_id)
+
+        if session.recommended_shows:
+            if session.connections == 0:
+                if len(session.recommended_shows) > 25:
+                    session.recommended_shows = random.sample(session.recommended_shows, 25)
+                else:
+                    self.sonashow_logger.info(f"Shuffling Shows")
+                    random.shuffle(session.recommended_shows)
+                session.recommended_show_ids = {item.id for item in session.recommended_shows}
+            socketio.emit("more_shows_loaded", [item.card() for item in session.recommended_shows], to=sid)
+
+        session.connections += 1
+        session.last_seen = time.time()
+
+    def disconnection(self, sid):
+        session = self.sessions.get(self.session_client_ids.pop(sid, None))
+        metrics.set("sonashow_connected_clients", len(self.session_client_ids))
+        if session is not None:
+            session.connections = max(0, session.connections - 1)
+            session.last_seen = time.time()
+
+    def render_metrics(self):
+        cache_stats = self.tmdb_cache.stats()
+        metrics.set("sonashow_tmdb_cache_requests_total", cache_stats["hits"], result="hit")
+        metrics.set("sonashow_tmdb_cache_requests_total", cache_stats["misses"], result="miss")
+        metrics.set("sonashow_tmdb_cache_entries", cache_stats["entries"])
+        metrics.set("sonashow_connected_clients", len(self.session_client_ids))
+        metrics.set("sonashow_sessions", len(self.sessions))
+        metrics.set("sonashow_library_shows", len(self.sonarr_items))
+        return metrics.render()
+
+    def start(self, session, data=None):
         try:
-            socketio.emit("clear")
-            self.new_found_shows_counter = 1
-            self.shows_to_use_in_search = []
-            self.recommended_shows = []
-
+            self.sync_library_from_store()
+            if session.client_id is not None:
+                socketio.emit("clear", to=session.client_id)
+            selected_items = set(data) if data is not None else set(self.session_selection(session))
+            session.selected = selected_items
+            seeds = []
             for item in self.sonarr_items:
-                item_name = item["name"]
-                if item_name in data:
-                    item["checked"] = True
-                    self.shows_to_use_in_search.append(item_name)
+                if item.name in selected_items:
+                    item.checked = True
+                    seeds.append(item.name)
                 else:
-                    item["checked"] = False
-
-            if self.shows_to_use_in_search:
-                self.stop_event.clear()
+                    item.checked = False
+            session.reset(seeds, demand=self.shows_per_page)
+            session.ready_shows.capacity = max(self.recommendation_pool_size, self.prefetch_buffer_size)
+            session.ready_shows.rescore(prior_votes=self.minimum_votes)
+
+            if session.seeds:
+                session.stop_event.clear()
+                self.template_session = session
+                if session.client_id is not None:
+                    self.state_store.set("template", session.client_id)
             else:
-                self.stop_event.set()
+                session.stop_event.set()
                 raise Exception("No Sonarr Shows Selected")
 
         except Exception as e:
             self.sonashow_logger.error(f"Startup Error: {str(e)}")
-            self.stop_event.set()
-            ret = {"Status": "Error", "Code": str(e), "Data": self.sonarr_items, "Running": not self.stop_event.is_set()}
-            socketio.emit("sonarr_sidebar_update", ret)
+            session.stop_event.set()
+            if session.client_id is not None:
+                socketio.emit("sonarr_sidebar_update", self.sidebar_summary(session, "Error", str(e)), to=session.client_id)
 
         else:
-            thread = threading.Thread(target=data_handler.find_similar_shows, name="Start_Finding_Thread")
-            thread.daemon = True
-            thread.start()
+            self.schedule_prefetch(session)
 
-    def request_shows_from_sonarr(self, checked=False):
+        finally:
+            self.save_session(session)
+            self.save_running_flag(session)
+
+    def stop(self, session):
+        session.stop_event.set()
+        self.save_running_flag(session)
+
+    def load_more_shows(self, session):
+        session.last_seen = time.time()
+        with session.lock:
+            if session.demand == 0 and session.last_seen - session.last_page_request > 0.5:
+                session.demand = self.shows_per_page
+                session.last_page_request = session.last_seen
+        self.deliver_shows(session)
+        self.emit_buffer.flush()
+
+        if session.demand > 0 and not session.ready_shows and session.new_found_shows_counter == 0 and not session.search_in_progress_flag:
+            if time.time() - session.last_exhausted_toast > 2:
+                session.last_exhausted_toast = time.time()
+                self.sonashow_logger.info("Search Exhausted - Try selecting more shows from existing Sonarr library")
+                self.emit_to_session(session, "new_toast_msg", {"title": "Search Exhausted", "message": "Try selecting more shows from existing Sonarr library"}, key="Search Exhausted")
+        else:
+            self.schedule_prefetch(session)
+
+    def deliver_shows(self, session):
+        with session.lock:
+            batch = []
+            while session.demand > 0 and session.ready_shows:
+                show = session.ready_shows.pop_best()
+                session.recommended_shows.append(show)
+                session.recommended_show_ids.add(show.id)
+                batch.append(show)
+                session.demand -= 1
+            if len(session.recommended_shows) > session.history_limit:
+                del session.recommended_shows[: -session.history_limit]
+
+        for show in batch:
+            self.emit_to_session(session, "more_shows_loaded", show.card())
+        if batch:
+            self.save_session(session)
+
+    def schedule_prefetch(self, session):
+        with session.lock:
+            if session.search_in_progress_flag or not session.is_running() or session.new_found_shows_counter == 0:
+                return
+            if len(session.ready_shows) >= self.prefetch_buffer_size:
+                return
+
+        self.job_scheduler.submit("prefetch", self.fill_prefetch_buffer, session, key=("prefetch", session), cancel_event=session.stop_event, context=session)
+
+    def report_job_status(self, session, status):
+        if session is not None:
+            self.emit_to_session(session, "job_status", status, key=status["Id"])
+
+    def fill_prefetch_buffer(self, session):
+        session.search_in_progress_flag = True
+        try:
+            self.sync_library_from_store()
+            empty_rounds = 0
+            while session.is_running() and len(session.ready_shows) < self.prefetch_buffer_size:
+                if self.is_stopped_elsewhere(session):
+                    session.stop_event.set()
+                    break
+                self.find_similar_shows(session)
+                self.deliver_shows(session)
+                empty_rounds = empty_rounds + 1 if session.new_found_shows_counter == 0 else 0
+                if session.new_found_shows_counter == 0 and (empty_rounds >= 5 or not session.has_available_seeds()):
+                    break
+
+            if session.new_found_shows_counter == 0 and session.demand > 0 and not session.ready_shows:
+                session.last_exhausted_toast = time.time()
+                self.sonashow_logger.info("Search Exhausted - Try selecting more shows from existing Sonarr library")
+                self.emit_to_session(session, "new_toast_msg", {"title": "Search Exhausted", "message": "Try selecting more shows from existing Sonarr library"}, key="Search Exhausted")
+
+        except Exception as e:
+            self.sonashow_logger.error(f"Prefetch Error: {str(e)}")
+
+        finally:
+            session.search_in_progress_flag = False
+            self.seed_scheduler.save(force=True)
+            self.emit_buffer.flush()
+
+    def request_shows_from_sonarr(self, session=None, checked=False):
         try:
             self.sonashow_logger.info(f"Getting Shows from Sonarr")
             self.sonarr_items = []
             endpoint = f"{self.sonarr_address}/api/v3/series"
             headers = {"X-Api-Key": self.sonarr_api_key}
-            response = requests.get(endpoint, headers=headers, timeout=self.sonarr_api_timeout)
+            start = time.perf_counter()
+            response = requests.get(endpoint, headers=headers, timeout=self.sonarr_api_timeout, stream=True)
+            metrics.observe_response("sonarr", start, response)
 
             if response.status_code == 200:
-                self.full_sonarr_show_list = response.json()
-                self.sonarr_items = [{"name": re.sub(r" \(\d{4}\)", "", unidecode(show["title"], replace_str=" ")), "checked": checked} for show in self.full_sonarr_show_list]
-                self.sonarr_items.sort(key=lambda x: x["name"].lower())
-                self.cleaned_sonarr_items = [item["name"].lower() for item in self.sonarr_items]
+                self.sonarr_items = self.parse_sonarr_series(response.iter_content(chunk_size=65536), checked)
+                self.library_index.clear()
+                for item in self.sonarr_items:
+                    self.library_index.add(item.name, tmdb_id=item.tmdb_id, tvdb_id=item.tvdb_id)
+                self.publish_library()
+                if session is not None:
+                    session.selected = None
                 status = "Success"
-                data = self.sonarr_items
+                code = None
             else:
                 status = "Error"
-                data = response.text
-
-            ret = {"Status": status, "Code": response.status_code if status == "Error" else None, "Data": data, "Running": not self.stop_event.is_set()}
+                code = response.status_code
 
         except Exception as e:
             self.sonashow_logger.error(f"Getting Show Error: {str(e)}")
-            ret = {"Status": "Error", "Code": 500, "Data": str(e), "Running": not self.stop_event.is_set()}
+            status = "Error"
+            code = 500
 
         finally:
-            socketio.emit("sonarr_sidebar_update", ret)
+            if session is not None:
+                socketio.emit("sonarr_sidebar_update", self.sidebar_summary(session, status, code), to=session.client_id)
+
+    def request_tmdb(self, url, params, cancel_event=None):
+        for attempt in range(5):
+            if not self.tmdb_rate_limiter.acquire(cancel_event):
+                return None
+            start = time.perf_counter()
+            response = self.tmdb_session.get(url, params=params, timeout=self.upstream_request_timeout)
+            metrics.observe_response("tmdb", start, response)
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.sonashow_logger.warning(f"TheMovieDB rate limit reached, retrying in {retry_after} seconds")
+                self.tmdb_rate_limiter.block_for(retry_after)
+                continue
+            response.raise_for_status()
+            return response.json()
+
+        raise Exception("TheMovieDB rate limit retries exceeded")
+
+    def sonarr_sync_loop(self):
+        while True:
+            time.sleep(self.sonarr_sync_interval * 60)
+            try:
+                if self.state_store.add("lease:sonarr_sync", os.getpid(), ttl=self.sonarr_sync_interval * 60 * 0.9):
+                    self.sync_library_from_store()
+                    self.sync_sonarr_library()
+            except Exception as e:
+                self.sonashow_logger.error(f"Sonarr Sync Error: {str(e)}")
+
+    def sync_sonarr_library(self):
+        if not self.sonarr_items:
+            return
+
+        endpoint = f"{self.sonarr_address}/api/v3/series"
+        headers = {"X-Api-Key": self.sonarr_api_key}
+        start = time.perf_counter()
+        response = requests.get(endpoint, headers=headers, timeout=self.sonarr_api_timeout, stream=True)
+        metrics.observe_response("sonarr", start, response)
+        response.raise_for_status()
+        latest_items = self.parse_sonarr_series(response.iter_content(chunk_size=65536))
+
+        def item_key(item):
+            return item.tvdb_id or normalize_title(item.name)
+
+        current = {item_key(item): item for item in self.sonarr_items}
+        latest = {item_key(item): item for item in latest_items}
+        added = [latest[key] for key in latest.keys() - current.keys()]
+        removed = [current[key] for key in current.keys() - latest.keys()]
+        if not added and not removed:
+            return
+
+        if removed:
+            removed_ids = {id(item) for item in removed}
+            self.sonarr_items = [item for item in self.sonarr_items if id(item) not in removed_ids]
+            removed_names = {item.name for item in removed}
+            for session in list(self.sessions.values()):
+                session.seeds = [name for name in session.seeds if name not in removed_names]
+                if session.selected is not None:
+                    session.selected -= removed_names
+            for item in removed:
+                self.library_index.remove(item.name, tmdb_id=item.tmdb_id, tvdb_id=item.tvdb_id)
+
+        for item in added:
+            bisect.insort(self.sonarr_items, item, key=lambda x: x.name.lower())
+            self.library_index.add(item.name, tmdb_id=item.tmdb_id, tvdb_id=item.tvdb_id)
+
+        self.publish_library()
+        self.sonashow_logger.info(f"Sonarr Sync - Added: {len(added)}  Removed: {len(removed)}")
+        ret = {"Added": [item.name for item in added], "Removed": [item.name for item in removed]}
+        socketio.emit("sonarr_sidebar_delta", ret)
+
+    def parse_sonarr_series(self, byte_chunks, checked=False):
+        utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        text_chunks = (utf8_decoder.decode(chunk) for chunk in byte_chunks)
+        sonarr_items = [SonarrSeries.from_sonarr(show, checked) for show in iter_json_array(text_chunks)]
+        sonarr_items.sort(key=lambda x: x.name.lower())
+        return sonarr_items
+
+    def refresh_metadata(self):
+        try:
+            self.metadata_registry.refresh(self.request_tmdb, self.tmdb_base_url, self.tmdb_api_key)
+        except Exception as e:
+            self.sonashow_logger.error(f"Metadata Refresh Error: {str(e)}")
 
-    def request_show_id(self, show_name):
-        url = f"https://api.themoviedb.org/3/search/tv"
+    def request_show_id(self, show_name, cancel_event=None):
+        cache_key = show_name.lower()
+        cached = self.tmdb_cache.get("search", cache_key)
+        if cached is not None:
+            return cached["id"]
+
+        url = f"{self.tmdb_base_url}/search/tv"
         params = {"api_key": self.tmdb_api_key, "query": show_name}
-        response = requests.get(url, params=params)
-        data = response.json()
-        if data:
-            return data["results"][0]["id"]
+        data = self.request_tmdb(url, params, cancel_event)
+        if data and data["results"]:
+            tv_show_id = data["results"][0]["id"]
+            self.tmdb_cache.set("search", cache_key, {"id": tv_show_id})
+            return tv_show_id
         else:
             return None
 
-    def request_similar_tv_shows(self, tv_show_id):
-        url = f"https://api.themoviedb.org/3/tv/{tv_show_id}/recommendations"
-        params = {"api_key": self.tmdb_api_key}
-        response = requests.get(url, params=params)
-        data = response.json()
+    def request_similar_tv_shows(self, tv_show_id, cancel_event=None, endpoint="recommendations", page=1, stats=None):
+        cache_key = f"{tv_show_id}:{page}"
+        data = self.tmdb_cache.get(endpoint, cache_key)
+        if data is None:
+            url = f"{self.tmdb_base_url}/tv/{tv_show_id}/{endpoint}"
+            params = {"api_key": self.tmdb_api_key, "page": page}
+            response_data = self.request_tmdb(url, params, cancel_event)
+            if response_data is None:
+                return None
+            data = {"results": response_data["results"], "total_pages": response_data.get("total_pages", 1)}
+            self.tmdb_cache.set(endpoint, cache_key, data)
+
         ret_list = []
 
         for show in data["results"]:
@@ -218,213 +1789,354 @@ class DataHandler:
                 if show.get("original_language", "en") == self.language_choice or self.language_choice == "all":
                     ret_list.append(show)
 
-        return ret_list
-
-    def map_genre_ids_to_names(self, genre_ids):
-        genre_mapping = {
-            10759: "Action & Adventure",
-            16: "Animation",
-            35: "Comedy",
-            80: "Crime",
-            99: "Documentary",
-            18: "Drama",
-            10751: "Family",
-            10762: "Kids",
-            9648: "Mystery",
-            10763: "News",
-            10764: "Reality",
-            10765: "Sci-Fi & Fantasy",
-            10766: "Soap",
-            10767: "Talk",
-            10768: "War & Politics",
-            37: "Western",
-        }
-        return [genre_mapping.get(genre_id, "Unknown") for genre_id in genre_ids]
+        if stats is not None:
+            stats["seen"] += len(data["results"])
+            stats["filtered"] += len(data["results"]) - len(ret_list)
+        return ret_list, data["total_pages"]
+
+    def request_seed_recommendations(self, session, show_name):
+        if session.stop_event.is_set():
+            return []
+
+        with metrics.track_worker("search"):
+            cursor = session.seed_cursors.get(show_name)
+            if cursor is None:
+                cursor = SeedCursor(["recommendations", "similar"] if self.include_similar_shows else ["recommendations"])
+                session.seed_cursors[show_name] = cursor
+
+            # The cursor only moves after a successful fetch, so an upstream error leaves the seed to be retried next round.
+            while not cursor.exhausted() and not session.stop_event.is_set():
+                if cursor.tv_show_id is None:
+                    cursor.tv_show_id = self.library_index.tmdb_id_for(show_name) or self.request_show_id(show_name, session.stop_event)
+                    if cursor.tv_show_id is None:
+                        if not session.stop_event.is_set():
+                            cursor.finish()
+                        break
+                result = self.request_similar_tv_shows(cursor.tv_show_id, session.stop_event, cursor.endpoint, cursor.page, session.round_stats)
+                if result is None:
+                    break
+                shows, total_pages = result
+                cursor.advance(total_pages)
+                if shows:
+                    return shows
+
+            if cursor.exhausted():
+                session.exhausted_seeds.add(show_name)
+            return []
 
-    def find_similar_shows(self):
-        if self.stop_event.is_set() or self.search_in_progress_flag:
+    def find_similar_shows(self, session):
+        if session.stop_event.is_set():
             return
-        elif self.new_found_shows_counter > 0:
-            try:
-                self.sonashow_logger.info(f"Searching for new shows")
-                self.new_found_shows_counter = 0
-                self.search_in_progress_flag = True
-                random_shows = random.sample(self.shows_to_use_in_search, min(10, len(self.shows_to_use_in_search)))
 
-                for show_name in random_shows:
-                    if self.stop_event.is_set():
-                        break
-                    tv_show_id = self.request_show_id(show_name)
-                    related_shows = self.request_similar_tv_shows(tv_show_id)
+        # Seed lookups from every session share one bounded pool, so stopped or slow rounds cannot stack up extra threads.
+        executor = self.job_scheduler.pool("search")
+        futures = {}
+        profiler = SamplingProfiler(self.sonashow_logger) if self.profile_similar_shows else None
+        round_start = time.perf_counter()
+        try:
+            if profiler:
+                profiler.start()
+            self.sonashow_logger.info(f"Searching for new shows")
+            session.new_found_shows_counter = 0
+            session.round_stats.clear()
+            random_shows = self.seed_scheduler.select(session, 10)
+            futures = {executor.submit(self.request_seed_recommendations, session, show_name): show_name for show_name in random_shows}
+            pending = set(futures)
+
+            while pending and not session.stop_event.is_set():
+                done, pending = concurrent.futures.wait(pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    show_name = futures[future]
+                    try:
+                        related_shows = future.result()
+                    except Exception as e:
+                        self.sonashow_logger.error(f"TheMovieDB Error for '{show_name}': {str(e)}")
+                        self.seed_scheduler.record(show_name, 0.0)
+                        continue
+
+                    seed_emitted = 0
                     for show in related_shows:
-                        if self.stop_event.is_set():
+                        if session.stop_event.is_set():
                             break
-                        cleaned_show = unidecode(show["name"]).lower()
-                        if cleaned_show in self.cleaned_sonarr_items:
+                        if show["id"] in session.recommended_show_ids:
+                            session.round_stats["deduped"] += 1
                             continue
-                        if any(show["name"] == item["Name"] for item in self.recommended_shows):
+                        with session.lock:
+                            pending_show = session.ready_shows.get(show["id"])
+                            if pending_show is not None:
+                                session.ready_shows.bump(show["id"])
+                                if show_name not in pending_show.base_shows:
+                                    pending_show.base_shows.append(show_name)
+                        if pending_show is not None:
+                            session.round_stats["deduped"] += 1
                             continue
-                        genres = ", ".join(self.map_genre_ids_to_names(show.get("genre_ids", [])))
-                        overview = show.get("overview", "")
-                        popularity = show.get("popularity", "")
-                        original_language_code = show.get("original_language", "en")
-                        original_language = Lang(original_language_code)
+                        if self.library_index.contains(tmdb_id=show["id"], title=show["name"]):
+                            session.round_stats["deduped"] += 1
+                            continue
+                        genres = ", ".join(self.metadata_registry.genre_names(show.get("genre_ids", [])))
+                        popularity = show.get("popularity") or 0.0
                         vote_count = show.get("vote_count", 0)
                         vote_avg = show.get("vote_average", 0)
-                        img_link = show.get("poster_path", "")
-                        date_string = show.get("first_air_date", "0000-01-01")
+                        img_link = show.get("poster_path") or ""
+                        date_string = show.get("first_air_date") or "0000-01-01"
                         year = date_string.split("-")[0]
-                        if img_link:
-                            img_url = f"https://image.tmdb.org/t/p/original/{img_link}"
-                        else:
-                            img_url = "https://via.placeholder.com/300x200"
-
-                        exclusive_show = {
-                            "Name": show["name"],
-                            "Year": year if year else "0000",
-                            "Genre": genres,
-                            "Status": "",
-                            "Img_Link": img_url,
-                            "Votes": f"Votes: {vote_count}",
-                            "Rating": f"Rating: {vote_avg}",
-                            "Overview": overview,
-                            "Language": original_language.name,
-                            "Popularity": popularity,
-                            "Base_Show": show_name,
-                        }
-                        self.recommended_shows.append(exclusive_show)
-                        socketio.emit("more_shows_loaded", [exclusive_show])
-                        self.new_found_shows_counter += 1
-
-                if self.new_found_shows_counter == 0:
-                    self.sonashow_logger.info("Search Exhausted - Try selecting more shows from existing Sonarr library")
-                    socketio.emit("new_toast_msg", {"title": "Search Exhausted", "message": "Try selecting more shows from existing Sonarr library"})
+                        self.cache_overview(show["id"], show.get("overview", ""), show.get("original_language", "en"))
+
+                        exclusive_show = Recommendation(
+                            show["id"],
+                            show["name"],
+                            year if year else "0000",
+                            genres,
+                            poster=img_link.lstrip("/"),
+                            vote_average=vote_avg,
+                            vote_count=vote_count,
+                            popularity=popularity,
+                            base_shows=[show_name],
+                        )
+                        with session.lock:
+                            session.ready_shows.add(show["id"], exclusive_show, vote_avg, vote_count, popularity)
+                        session.new_found_shows_counter += 1
+                        session.round_stats["emitted"] += 1
+                        seed_emitted += 1
+
+                    if not session.stop_event.is_set():
+                        self.seed_scheduler.record(show_name, seed_emitted / 20)
+                    # Popping as soon as the first seed answers would rank a page from one seed, so hold delivery for the round unless the client has waited too long.
+                    if time.perf_counter() - round_start > self.delivery_wait_seconds:
+                        self.deliver_shows(session)
+
+            self.deliver_shows(session)
+            cache_stats = self.tmdb_cache.stats()
+            self.sonashow_logger.info(f"TMDB Cache - Hits: {cache_stats['hits']}  Misses: {cache_stats['misses']}  Entries: {cache_stats['entries']}")
 
-            except Exception as e:
-                self.sonashow_logger.error(f"TheMovieDB Error: {str(e)}")
+        except Exception as e:
+            self.sonashow_logger.error(f"TheMovieDB Error: {str(e)}")
 
-            finally:
-                self.search_in_progress_flag = False
+        finally:
+            for future in futures:
+                future.cancel()
+            self.seed_scheduler.save()
+            if profiler:
+                profiler.stop()
+            round_duration = time.perf_counter() - round_start
+            round_stats = dict(session.round_stats)
+            metrics.observe("sonashow_round_duration_seconds", round_duration)
+            metrics.inc("sonashow_rounds_total", result="found" if session.new_found_shows_counter else "exhausted")
+            for stage in ("seen", "filtered", "deduped", "emitted"):
+                metrics.inc("sonashow_round_candidates_total", round_stats.get(stage, 0), stage=stage)
+            self.sonashow_logger.info(f"Round finished in {round_duration:.2f}s - Seen: {round_stats.get('seen', 0)}  Filtered: {round_stats.get('filtered', 0)}  Deduped: {round_stats.get('deduped', 0)}  Emitted: {round_stats.get('emitted', 0)}")
+
+    def add_shows(self, session, data):
+        for raw_show_name, show_year in data:
+            show_name = urllib.parse.unquote(raw_show_name)
+            key = normalize_title(show_name)
+            with self.add_queue_lock:
+                if key in self.pending_adds:
+                    continue
+                self.pending_adds.add(key)
+                self.add_queue.append((session, show_name, show_year))
+                start_worker = not self.add_worker_running
+                self.add_worker_running = True
+
+            self.report_add_status(show_name, "Queued")
+            if start_worker:
+                self.job_scheduler.submit("adder", self.process_add_queue, context=session)
+
+    def process_add_queue(self):
+        while True:
+            time.sleep(0.25)
+            with self.add_queue_lock:
+                batch = [self.add_queue.popleft() for _ in range(min(len(self.add_queue), 50))]
+                if not batch:
+                    self.add_worker_running = False
+                    return
 
-        elif self.new_found_shows_counter == 0:
             try:
-                self.search_in_progress_flag = True
-                self.sonashow_logger.info("Search Exhausted - Try selecting more shows from existing Sonarr library")
-                socketio.emit("new_toast_msg", {"title": "Search Exhausted", "message": "Try selecting more shows from existing Sonarr library"})
-                time.sleep(2)
-
+                self.add_batch(batch)
             except Exception as e:
-                self.sonashow_logger.error(f"Search Exhausted Error: {str(e)}")
-
+                self.sonashow_logger.error(f"Adding Show Error: {str(e)}")
+                for _, show_name, _ in batch:
+                    self.report_add_status(show_name, "Failed to Add")
             finally:
-                self.search_in_progress_flag = False
+                with self.add_queue_lock:
+                    self.pending_adds.difference_update(normalize_title(show_name) for _, show_name, _ in batch)
 
-    def add_shows(self, data):
+    def resolve_tvdb_id(self, item):
+        session, show_name, show_year = item
         try:
-            raw_show_name, show_year = data
-            show_name = urllib.parse.unquote(raw_show_name)
-            show_folder = show_name.replace("/", " ")
-            tvdb_id = self.request_tvdb_id(show_name, show_year)
-            if tvdb_id:
-                sonarr_url = f"{self.sonarr_address}/api/v3/series"
-                headers = {"X-Api-Key": self.sonarr_api_key}
-                payload = {
-                    "title": show_name,
-                    "qualityProfileId": self.quality_profile_id,
-                    "metadataProfileId": self.metadata_profile_id,
-                    "titleSlug": show_name.lower().replace(" ", "-"),
-                    "rootFolderPath": self.root_folder_path,
-                    "tvdbId": tvdb_id,
-                    "seasonFolder": True,
-                    "monitored": True,
-                    "addOptions": {
-                        "monitor": "all",
-                        "searchForMissingEpisodes": self.search_for_missing_episodes,
-                    },
-                }
-                if self.dry_run_adding_to_sonarr:
-                    response = requests.Response()
-                    response.status_code = 201
-                else:
-                    response = requests.post(sonarr_url, headers=headers, json=payload)
+            return self.request_tvdb_id(show_name, show_year)
+        except Exception as e:
+            self.sonashow_logger.error(f"TVDB Error for '{show_name}': {str(e)}")
+            return None
 
-                if response.status_code == 201:
-                    self.sonashow_logger.info(f"Show '{show_name}' added successfully to Sonarr.")
-                    status = "Added"
-                    self.sonarr_items.append({"name": show_name, "checked": False})
-                    self.cleaned_sonarr_items.append(unidecode(show_name).lower())
-                else:
-                    self.sonashow_logger.error(f"Failed to add show '{show_name}' to Sonarr.")
-                    error_data = json.loads(response.content)
-                    error_message = error_data[0].get("errorMessage", "Unknown Error")
-                    self.sonashow_logger.error(error_message)
-                    if "already exists in the database" in error_message:
-                        status = "Already in Sonarr"
-                        self.sonashow_logger.info(f"Show '{show_name}' is already in Sonarr.")
-                    elif "configured for an existing show" in error_message:
-                        status = "Already in Sonarr"
-                        self.sonashow_logger.info(f"'{show_folder}' folder already configured for an existing show.")
-                    elif "Invalid Path" in error_message:
-                        status = "Invalid Path"
-                        self.sonashow_logger.info(f"Path: {os.path.join(self.root_folder_path, show_folder, '')} not valid.")
-                    elif "series with this ID was not found" in error_message:
-                        status = "Invalid Series ID"
-                        self.sonashow_logger.info(f"ID: {tvdb_id} for '{show_folder}' not correct")
-                    else:
-                        status = "Failed to Add"
+    def add_batch(self, batch):
+        tvdb_ids = list(self.job_scheduler.pool("tvdb").map(self.resolve_tvdb_id, batch))
 
+        resolved = []
+        for (session, show_name, show_year), tvdb_id in zip(batch, tvdb_ids):
+            if tvdb_id:
+                # TVDB search returns ids as strings while Sonarr returns ints, so they are stored as ints to keep library keys comparable.
+                resolved.append((show_name, int(tvdb_id)))
             else:
-                status = "Failed to Add"
                 self.sonashow_logger.info(f"No Matching Show for: '{show_name}' in The Movie Database.")
-                socketio.emit("new_toast_msg", {"title": "Failed to add Show", "message": f"No Matching Show for: '{show_name}' in The Movie Database."})
+                if session is not None:
+                    self.emit_to_session(session, "new_toast_msg", {"title": "Failed to add Show", "message": f"No Matching Show for: '{show_name}' in The Movie Database."}, key=f"Failed to add Show: {show_name}")
+                self.report_add_status(show_name, "Failed to Add")
+        if not resolved:
+            return
 
-            for item in self.recommended_shows:
-                if item["Name"] == show_name:
-                    item["Status"] = status
-                    socketio.emit("refresh_show", item)
-                    break
+        payloads = [self.build_series_payload(show_name, tvdb_id) for show_name, tvdb_id in resolved]
+        if self.dry_run_adding_to_sonarr:
+            statuses = ["Added"] * len(resolved)
+        else:
+            sonarr_url = f"{self.sonarr_address}/api/v3/series/import"
+            headers = {"X-Api-Key": self.sonarr_api_key}
+            start = time.perf_counter()
+            response = requests.post(sonarr_url, headers=headers, json=payloads, timeout=self.sonarr_api_timeout)
+            metrics.observe_response("sonarr", start, response)
+            imported = set()
+            if response.ok:
+                try:
+                    imported = {str(series.get("tvdbId")) for series in response.json() if isinstance(series, dict)}
+                except (ValueError, TypeError):
+                    pass
+            else:
+                self.sonashow_logger.warning(f"Sonarr bulk import of {len(resolved)} shows failed with status {response.status_code}, adding them one at a time.")
+            # The import endpoint only returns the series it created, anything it skipped is retried on its own to get a real status.
+            statuses = ["Added" if str(tvdb_id) in imported else self.add_series(show_name, tvdb_id, payload) for (show_name, tvdb_id), payload in zip(resolved, payloads)]
+
+        added = []
+        for (show_name, tvdb_id), status in zip(resolved, statuses):
+            if status == "Added":
+                self.sonashow_logger.info(f"Show '{show_name}' added successfully to Sonarr.")
+                bisect.insort(self.sonarr_items, SonarrSeries(show_name, tvdb_id=tvdb_id), key=lambda x: x.name.lower())
+                self.library_index.add(show_name, tvdb_id=tvdb_id)
+                added.append(show_name)
+            self.report_add_status(show_name, status)
+        if added:
+            self.publish_library()
+            socketio.emit("sonarr_sidebar_delta", {"Added": added, "Removed": []})
+
+    def build_series_payload(self, show_name, tvdb_id):
+        return {
+            "title": show_name,
+            "qualityProfileId": self.quality_profile_id,
+            "metadataProfileId": self.metadata_profile_id,
+            "titleSlug": show_name.lower().replace(" ", "-"),
+            "rootFolderPath": self.root_folder_path,
+            "tvdbId": tvdb_id,
+            "seasonFolder": True,
+            "monitored": True,
+            "addOptions": {
+                "monitor": "all",
+                "searchForMissingEpisodes": self.search_for_missing_episodes,
+            },
+        }
+
+    def add_series(self, show_name, tvdb_id, payload):
+        show_folder = show_name.replace("/", " ")
+        try:
+            sonarr_url = f"{self.sonarr_address}/api/v3/series"
+            headers = {"X-Api-Key": self.sonarr_api_key}
+            start = time.perf_counter()
+            response = requests.post(sonarr_url, headers=headers, json=payload, timeout=self.sonarr_api_timeout)
+            metrics.observe_response("sonarr", start, response)
+            if response.status_code == 201:
+                return "Added"
+
+            self.sonashow_logger.error(f"Failed to add show '{show_name}' to Sonarr.")
+            try:
+                error_data = response.json()
+            except ValueError:
+                error_data = response.text
+            if isinstance(error_data, list) and error_data and isinstance(error_data[0], dict):
+                error_message = error_data[0].get("errorMessage", "Unknown Error")
+            else:
+                error_message = str(error_data) or "Unknown Error"
 
         except Exception as e:
-            self.sonashow_logger.error(f"Adding Show Error: {str(e)}")
+            self.sonashow_logger.error(f"Failed to add show '{show_name}' to Sonarr. Error: {str(e)}")
+            return "Failed to Add"
+
+        self.sonashow_logger.error(error_message)
+        if "already exists in the database" in error_message:
+            self.sonashow_logger.info(f"Show '{show_name}' is already in Sonarr.")
+            return "Already in Sonarr"
+        elif "configured for an existing show" in error_message:
+            self.sonashow_logger.info(f"'{show_folder}' folder already configured for an existing show.")
+            return "Already in Sonarr"
+        elif "Invalid Path" in error_message:
+            self.sonashow_logger.info(f"Path: {os.path.join(self.root_folder_path, show_folder, '')} not valid.")
+            return "Invalid Path"
+        elif "series with this ID was not found" in error_message:
+            self.sonashow_logger.info(f"ID: {tvdb_id} for '{show_folder}' not correct")
+            return "Invalid Series ID"
+        return "Failed to Add"
+
+    def report_add_status(self, show_name, status):
+        for recipient in list(self.sessions.values()):
+            for item in recipient.recommended_shows:
+                if item.name == show_name:
+                    item.status = status
+                    self.emit_to_session(recipient, "refresh_show", item.card(), key=show_name)
+                    break
 
-    def request_bearer_token(self):
-        login_url = "https://api4.thetvdb.com/v4/login"
-        headers = {"Content-Type": "application/json"}
-        login_data = {"apikey": self.tvdb_api_key}
-        response = requests.post(login_url, headers=headers, json=login_data)
-        response.raise_for_status()
-        token = response.json()["data"]["token"]
-        return token
+    def cache_overview(self, show_id, overview, language_code):
+        with self.overview_cache_lock:
+            self.overview_cache[show_id] = (overview, language_code)
+            self.overview_cache.move_to_end(show_id)
+            if len(self.overview_cache) > 5000:
+                self.overview_cache.popitem(last=False)
+
+    def request_overview(self, session, show_id):
+        try:
+            show = next((item for item in reversed(session.recommended_shows) if item.id == show_id), None)
+            if show is None:
+                raise Exception(f"Unknown show id: {show_id}")
+
+            with self.overview_cache_lock:
+                cached = self.overview_cache.get(show_id)
+            if cached is None:
+                data = self.request_tmdb(f"{self.tmdb_base_url}/tv/{show_id}", {"api_key": self.tmdb_api_key})
+                self.cache_overview(show_id, data.get("overview", ""), data.get("original_language", "en"))
+                cached = (data.get("overview", ""), data.get("original_language", "en"))
+
+            overview, language_code = cached
+            return show.details(overview, self.metadata_registry.language_name(language_code))
+
+        except Exception as e:
+            self.sonashow_logger.error(f"Overview Error: {str(e)}")
+            return {"Id": show_id, "Error": str(e)}
 
     def request_tvdb_id(self, show_name, show_year):
+        memo_key = (normalize_title(show_name), str(show_year))
+        with self.tvdb_id_memo_lock:
+            if memo_key in self.tvdb_id_memo:
+                self.tvdb_id_memo.move_to_end(memo_key)
+                return self.tvdb_id_memo[memo_key]
+
         tvdb_id = None
-        cleaned_show_name = urllib.parse.quote_plus(show_name)
-        tvdb_url = f"https://api4.thetvdb.com/v4/search?query={cleaned_show_name}"
-        bearer_token = self.request_bearer_token()
-        headers = {"Authorization": f"Bearer {bearer_token}"}
-        response = requests.get(tvdb_url, headers=headers)
-        response.raise_for_status()
-        if response.status_code == 200:
-            tvdb_data = response.json()
-            if "data" in tvdb_data:
-                shows = tvdb_data["data"]
-                for show in shows:
-                    match_ratio = fuzz.ratio(f"{show_name.lower()} ({show_year})", show["name"].lower())
-                    decoded_match_ratio = fuzz.ratio(unidecode(show_name.lower()), unidecode(show["name"].lower()))
-                    if match_ratio > 90 or decoded_match_ratio > 90 and show_year == show["year"]:
-                        tvdb_id = show["tvdb_id"]
-                        self.sonashow_logger.info(f"Show '{show_name}' matched '{show['name']}' with TVDB_ID: {tvdb_id}  Match Ratio: {max(match_ratio, decoded_match_ratio)}")
-                        break
-                else:
-                    if self.fallback_to_top_result and shows:
-                        top_match_ratio = fuzz.ratio(show_name.lower(), shows[0]["name"].lower())
-                        top_decoded_match_ratio = fuzz.ratio(unidecode(show_name.lower()), unidecode(shows[0]["name"].lower()))
-                        tvdb_id = shows[0]["tvdb_id"]
-                        self.sonashow_logger.info(f"Show '{show_name}' matched '{shows[0]['name']}' with TVDB_ID: {tvdb_id}  Match Ratio: {max(top_match_ratio, top_decoded_match_ratio)}")
+        shows = self.tvdb_client.search(show_name)
+        if shows:
+            matcher = TitleMatcher([show["name"] for show in shows], [show.get("year", "") for show in shows])
+            best_match = matcher.best_match(show_name, show_year)
+            if best_match is not None:
+                tvdb_id = shows[best_match["index"]]["tvdb_id"]
+                self.sonashow_logger.info(f"Show '{show_name}' matched '{best_match['name']}' with TVDB_ID: {tvdb_id}  Match Score: {best_match}")
+            elif self.fallback_to_top_result:
+                top_match = matcher.score(show_name)[0]
+                tvdb_id = shows[0]["tvdb_id"]
+                self.sonashow_logger.info(f"Show '{show_name}' matched '{shows[0]['name']}' with TVDB_ID: {tvdb_id}  Match Score: {top_match}")
+
+        if tvdb_id:
+            with self.tvdb_id_memo_lock:
+                self.tvdb_id_memo[memo_key] = tvdb_id
+                if len(self.tvdb_id_memo) > 1000:
+                    self.tvdb_id_memo.popitem(last=False)
 
         return tvdb_id
 
-    def load_settings(self):
+    def load_settings(self, sid):
         try:
             data = {
                 "sonarr_address": self.sonarr_address,
@@ -432,8 +2144,10 @@ class DataHandler:
                 "root_folder_path": self.root_folder_path,
                 "tvdb_api_key": self.tvdb_api_key,
                 "tmdb_api_key": self.tmdb_api_key,
+                "minimum_rating": self.minimum_rating,
+                "minimum_votes": self.minimum_votes,
             }
-            socketio.emit("settingsLoaded", data)
+            socketio.emit("settingsLoaded", data, to=sid)
         except Exception as e:
             self.sonashow_logger.error(f"Failed to load settings: {str(e)}")
 
@@ -444,9 +2158,22 @@ class DataHandler:
             self.root_folder_path = data["root_folder_path"]
             self.tvdb_api_key = data["tvdb_api_key"]
             self.tmdb_api_key = data["tmdb_api_key"]
+            self.tvdb_client.set_api_key(self.tvdb_api_key)
+            minimum_rating = float(data.get("minimum_rating", self.minimum_rating))
+            minimum_votes = int(data.get("minimum_votes", self.minimum_votes))
+            if (minimum_rating, minimum_votes) != (self.minimum_rating, self.minimum_votes):
+                self.minimum_rating = minimum_rating
+                self.minimum_votes = minimum_votes
+                self.rescore_recommendations()
         except Exception as e:
             self.sonashow_logger.error(f"Failed to update settings: {str(e)}")
 
+    def rescore_recommendations(self):
+        for session in list(self.sessions.values()):
+            with session.lock:
+                session.ready_shows.rescore(prior_votes=self.minimum_votes, minimum_rating=self.minimum_rating, minimum_votes=self.minimum_votes)
+        self.sonashow_logger.info(f"Recommendations rescored - Minimum Rating: {self.minimum_rating}  Minimum Votes: {self.minimum_votes}")
+
     def save_config_to_file(self):
         try:
             with open(self.settings_config_file, "w") as json_file:
@@ -468,6 +2195,20 @@ class DataHandler:
                         "language_choice": self.language_choice,
                         "auto_start": self.auto_start,
                         "auto_start_delay": self.auto_start_delay,
+                        "tmdb_search_cache_ttl_hours": self.tmdb_search_cache_ttl_hours,
+                        "tmdb_recommendations_cache_ttl_hours": self.tmdb_recommendations_cache_ttl_hours,
+                        "tmdb_cache_max_entries": self.tmdb_cache_max_entries,
+                        "search_workers": self.search_workers,
+                        "tmdb_requests_per_second": self.tmdb_requests_per_second,
+                        "sonarr_sync_interval": self.sonarr_sync_interval,
+                        "session_idle_timeout": self.session_idle_timeout,
+                        "prefetch_buffer_size": self.prefetch_buffer_size,
+                        "include_similar_shows": self.include_similar_shows,
+                        "poster_cache_max_mb": self.poster_cache_max_mb,
+                        "profile_similar_shows": self.profile_similar_shows,
+                        "upstream_request_timeout": self.upstream_request_timeout,
+                        "state_backend": self.state_backend,
+                        "recommendation_pool_size": self.recommendation_pool_size,
                     },
                     json_file,
                     indent=4,
@@ -477,51 +2218,110 @@ class DataHandler:
             self.sonashow_logger.error(f"Error Saving Config: {str(e)}")
 
 
+class InstrumentedSocketIO(SocketIO):
+    byte_sample_rate = 16
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.emit_counts = Counter()
+
+    def emit(self, event, *args, **kwargs):
+        metrics.inc("sonashow_socketio_emits_total", event=event)
+        self.emit_counts[event] += 1
+        # Serializing a payload only to measure it doubles the cost of an emit, so one in every byte_sample_rate is measured and scaled up.
+        if self.emit_counts[event] % self.byte_sample_rate == 1:
+            metrics.inc("sonashow_socketio_emit_bytes_total", len(json.dumps(args, default=str)) * self.byte_sample_rate, event=event)
+        return super().emit(event, *args, **kwargs)
+
+
+metrics = Metrics()
 app = Flask(__name__)
 app.secret_key = "secret_key"
-socketio = SocketIO(app)
+socketio = InstrumentedSocketIO(app, message_queue=os.environ.get("socketio_message_queue") or None)
+websocket_only = int(os.environ.get("gunicorn_workers") or 1) > 1
 data_handler = DataHandler()
 
 
 @app.route("/")
 def home():
-    return render_template("base.html")
+    return render_template("base.html", websocket_only=websocket_only)
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(data_handler.render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/poster/<size>/<filename>")
+def poster(size, filename):
+    try:
+        path = data_handler.poster_cache.get(size, filename)
+    except Exception as e:
+        data_handler.sonashow_logger.error(f"Poster Error: {str(e)}")
+        abort(502)
+    if path is None:
+        abort(404)
+
+    etag = hashlib.sha1(f"{size}/{filename}".encode()).hexdigest()
+    response = send_file(path, max_age=31536000, etag=etag, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 @socketio.on("side_bar_opened")
 def side_bar_opened():
-    if data_handler.sonarr_items:
-        ret = {"Status": "Success", "Data": data_handler.sonarr_items, "Running": not data_handler.stop_event.is_set()}
-        socketio.emit("sonarr_sidebar_update", ret)
+    session = data_handler.get_session(request.sid)
+    data_handler.sync_library_from_store()
+    if data_handler.sonarr_items and session:
+        socketio.emit("sonarr_sidebar_update", data_handler.sidebar_summary(session), to=request.sid)
+
+
+@socketio.on("sidebar_page_req")
+def sidebar_page_req(data):
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        socketio.emit("sonarr_sidebar_page", data_handler.sidebar_page(session, data), to=request.sid)
+
+
+@socketio.on("sidebar_select")
+def sidebar_select(data):
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        socketio.emit("sonarr_sidebar_selection", data_handler.sidebar_select(session, data), to=request.sid)
 
 
 @socketio.on("get_sonarr_shows")
 def get_sonarr_shows():
-    thread = threading.Thread(target=data_handler.request_shows_from_sonarr, name="Sonarr_Thread")
-    thread.daemon = True
-    thread.start()
+    session = data_handler.get_session(request.sid)
+    data_handler.job_scheduler.submit("sonarr", data_handler.request_shows_from_sonarr, session, key=("sonarr", session), context=session)
 
 
 @socketio.on("adder")
 def add_shows(data):
-    thread = threading.Thread(target=data_handler.add_shows, args=(data,), name="Add_Shows_Thread")
-    thread.daemon = True
-    thread.start()
+    session = data_handler.get_session(request.sid)
+    data_handler.add_shows(session, [data])
+
+
+@socketio.on("add_visible")
+def add_visible(data):
+    session = data_handler.get_session(request.sid)
+    data_handler.add_shows(session, data)
 
 
 @socketio.on("connect")
-def connection():
-    data_handler.connection()
+def connection(auth=None):
+    data_handler.connection(request.sid, auth)
 
 
 @socketio.on("disconnect")
-def disconnection():
-    data_handler.disconnection()
+def disconnection(reason=None):
+    data_handler.disconnection(request.sid)
 
 
 @socketio.on("load_settings")
 def load_settings():
-    data_handler.load_settings()
+    data_handler.load_settings(request.sid)
 
 
 @socketio.on("update_settings")
@@ -531,20 +2331,31 @@ def update_settings(data):
 
 
 @socketio.on("start_req")
-def starter(data):
-    data_handler.start(data)
+def starter(data=None):
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        data_handler.start(session, data)
 
 
 @socketio.on("stop_req")
 def stopper():
-    data_handler.stop_event.set()
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        data_handler.stop(session)
+
+
+@socketio.on("overview_req")
+def overview_req(show_id):
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        socketio.emit("overview_loaded", data_handler.request_overview(session, show_id), to=request.sid)
 
 
 @socketio.on("load_more_shows")
 def load_more_shows():
-    thread = threading.Thread(target=data_handler.find_similar_shows, name="Find_Similar")
-    thread.daemon = True
-    thread.start()
+    session = data_handler.get_session(request.sid)
+    if session is not None:
+        data_handler.load_more_shows(session)
 
 
 if __name__ == "__main__":
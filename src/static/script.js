@@ -1,9 +1,13 @@
 var return_to_top = document.getElementById("return-to-top");
+var add_visible_button = document.getElementById("add-visible-button");
 var sonarr_get_shows_button = document.getElementById('sonarr-get-shows-button');
 var start_stop_button = document.getElementById('start-stop-button');
 var sonarr_status = document.getElementById('sonarr-status');
 var sonarr_spinner = document.getElementById('sonarr-spinner');
 var sonarr_item_list = document.getElementById("sonarr-item-list");
+var sonarr_item_spacer = document.getElementById("sonarr-item-spacer");
+var sonarr_search = document.getElementById("sonarr-search");
+var sonarr_selected_count = document.getElementById("sonarr-selected-count");
 var sonarr_select_all_checkbox = document.getElementById("sonarr-select-all");
 var sonarr_select_all_container = document.getElementById("sonarr-select-all-container");
 var config_modal = document.getElementById('config-modal');
@@ -15,43 +19,131 @@ const sonarr_api_key = document.getElementById("sonarr-api-key");
 const root_folder_path = document.getElementById("root-folder-path");
 const tvdb_api_key = document.getElementById("tvdb-api-key");
 const tmdb_api_key = document.getElementById("tmdb-api-key");
-var sonarr_items = [];
-var socket = io();
-
-function check_if_all_selected() {
-    var checkboxes = document.querySelectorAll('input[name="sonarr-item"]');
-    var all_checked = true;
-    for (var i = 0; i < checkboxes.length; i++) {
-        if (!checkboxes[i].checked) {
-            all_checked = false;
-            break;
-        }
-    }
-    sonarr_select_all_checkbox.checked = all_checked;
+const minimum_rating = document.getElementById("minimum-rating");
+const minimum_votes = document.getElementById("minimum-votes");
+const sonarr_row_height = 30;
+const sonarr_page_size = 100;
+var sonarr_total = 0;
+var sonarr_query = "";
+var sonarr_pages = {};
+var sonarr_pending_pages = new Set();
+var sonarr_selected = 0;
+var sonarr_running = false;
+var sonarr_render_pending = false;
+var sonarr_search_timer = null;
+var client_id = localStorage.getItem('client-id');
+if (!client_id) {
+    client_id = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    localStorage.setItem('client-id', client_id);
+}
+var socket_transports = document.body.dataset.websocketOnly === 'true' ? ['websocket'] : ['polling', 'websocket'];
+var socket = io({ auth: { client_id: client_id }, transports: socket_transports });
+
+function update_sonarr_selection(selection) {
+    sonarr_selected = selection.Selected;
+    sonarr_select_all_checkbox.checked = selection.All_Selected;
+    sonarr_selected_count.textContent = `${selection.Selected} selected`;
 }
 
 function load_sonarr_data(response) {
-    var every_check_box = document.querySelectorAll('input[name="sonarr-item"]');
+    sonarr_running = response.Running;
     if (response.Running) {
         start_stop_button.classList.remove('btn-success');
         start_stop_button.classList.add('btn-warning');
         start_stop_button.textContent = "Stop";
-        every_check_box.forEach(item => {
-            item.disabled = true;
-        });
         sonarr_select_all_checkbox.disabled = true;
         sonarr_get_shows_button.disabled = true;
     } else {
         start_stop_button.classList.add('btn-success');
         start_stop_button.classList.remove('btn-warning');
         start_stop_button.textContent = "Start";
-        every_check_box.forEach(item => {
-            item.disabled = false;
-        });
         sonarr_select_all_checkbox.disabled = false;
         sonarr_get_shows_button.disabled = false;
     }
-    check_if_all_selected();
+    render_sonarr_rows();
+}
+
+function reset_sonarr_list() {
+    sonarr_total = 0;
+    sonarr_pages = {};
+    sonarr_pending_pages.clear();
+    sonarr_item_spacer.style.height = "0px";
+    sonarr_item_spacer.replaceChildren();
+}
+
+function load_sonarr_list() {
+    sonarr_pages = {};
+    sonarr_pending_pages.clear();
+    request_sonarr_page(0);
+    render_sonarr_rows();
+}
+
+function request_sonarr_page(page) {
+    if (sonarr_pages[page] || sonarr_pending_pages.has(page)) {
+        return;
+    }
+    sonarr_pending_pages.add(page);
+    socket.emit("sidebar_page_req", { "Query": sonarr_query, "Offset": page * sonarr_page_size, "Limit": sonarr_page_size });
+}
+
+function render_sonarr_rows() {
+    var first = Math.max(0, Math.floor(sonarr_item_list.scrollTop / sonarr_row_height) - 10);
+    var last = Math.min(sonarr_total, Math.ceil((sonarr_item_list.scrollTop + sonarr_item_list.clientHeight) / sonarr_row_height) + 10);
+    var rows = [];
+    for (var index = first; index < last; index++) {
+        var page = Math.floor(index / sonarr_page_size);
+        if (!sonarr_pages[page]) {
+            request_sonarr_page(page);
+            continue;
+        }
+        var item = sonarr_pages[page][index % sonarr_page_size];
+        if (item) {
+            rows.push(create_sonarr_item(item, index));
+        }
+    }
+    sonarr_item_spacer.replaceChildren(...rows);
+}
+
+function schedule_sonarr_render() {
+    if (!sonarr_render_pending) {
+        sonarr_render_pending = true;
+        requestAnimationFrame(function () {
+            sonarr_render_pending = false;
+            render_sonarr_rows();
+        });
+    }
+}
+
+function create_sonarr_item(item, index) {
+    var item_id = "sonarr-" + index;
+
+    var div = document.createElement("div");
+    div.className = "form-check";
+    div.style.top = `${index * sonarr_row_height}px`;
+
+    var input = document.createElement("input");
+    input.type = "checkbox";
+    input.className = "form-check-input";
+    input.id = item_id;
+    input.name = "sonarr-item";
+    input.value = item.name;
+    input.checked = item.checked;
+    input.disabled = sonarr_running;
+
+    var label = document.createElement("label");
+    label.className = "form-check-label";
+    label.htmlFor = item_id;
+    label.textContent = item.name;
+    label.title = item.name;
+
+    input.addEventListener("change", function () {
+        item.checked = input.checked;
+        socket.emit("sidebar_select", { "Query": sonarr_query, "Names": [item.name], "Checked": input.checked });
+    });
+
+    div.appendChild(input);
+    div.appendChild(label);
+    return div;
 }
 
 function append_shows(shows) {
@@ -62,13 +154,18 @@ function append_shows(shows) {
         var show_col = clone.querySelector('#show-column');
 
         show_col.querySelector('.card-title').textContent = `${show.Name} (${show.Year})`;
+        show_col.dataset.name = show.Name;
+        show_col.dataset.year = show.Year;
         show_col.querySelector('.genre').textContent = show.Genre;
-        if (show.Img_Link) {
-            show_col.querySelector('.card-img-top').src = show.Img_Link;
-            show_col.querySelector('.card-img-top').alt = show.Name;
+        var card_img = show_col.querySelector('.card-img-top');
+        if (show.Poster) {
+            card_img.srcset = `poster/w185/${show.Poster} 185w, poster/w342/${show.Poster} 342w, poster/w500/${show.Poster} 500w`;
+            card_img.sizes = "(min-width: 1400px) 17vw, (min-width: 768px) 34vw, 100vw";
+            card_img.src = `poster/w342/${show.Poster}`;
         } else {
-            show_col.querySelector('.show-img-container').removeChild(show_col.querySelector('.card-img-top'));
+            card_img.src = "https://via.placeholder.com/300x200";
         }
+        card_img.alt = show.Name;
         show_col.querySelector('.add-to-sonarr-btn').addEventListener('click', function () {
             var add_button = this;
             add_button.disabled = true;
@@ -78,8 +175,8 @@ function append_shows(shows) {
         show_col.querySelector('.get-overview-btn').addEventListener('click', function () {
             overview_req(show);
         });
-        show_col.querySelector('.votes').textContent = show.Votes;
-        show_col.querySelector('.rating').textContent = show.Rating;
+        show_col.querySelector('.votes').textContent = `Votes: ${show.Votes}`;
+        show_col.querySelector('.rating').textContent = `Rating: ${show.Rating}`;
 
         var add_button = show_col.querySelector('.add-to-sonarr-btn');
         if (show.Status === "Added" || show.Status === "Already in Sonarr") {
@@ -88,6 +185,10 @@ function append_shows(shows) {
             add_button.classList.add('btn-secondary');
             add_button.disabled = true;
             add_button.textContent = show.Status;
+        } else if (show.Status === "Queued") {
+            show_col.querySelector('.card-body').classList.add('status-blue');
+            add_button.disabled = true;
+            add_button.textContent = "Queued";
         } else if (show.Status === "Failed to Add" || show.Status === "Invalid Path") {
             show_col.querySelector('.card-body').classList.add('status-red');
             add_button.classList.remove('btn-primary');
@@ -127,23 +228,59 @@ function show_toast(header, message) {
     });
 }
 
+add_visible_button.addEventListener("click", function () {
+    var visible_shows = [];
+    document.querySelectorAll('#show-column').forEach(function (card) {
+        var rect = card.getBoundingClientRect();
+        var add_button = card.querySelector('.add-to-sonarr-btn');
+        if (rect.bottom > 0 && rect.top < window.innerHeight && !add_button.disabled) {
+            add_button.disabled = true;
+            add_button.textContent = "Adding...";
+            visible_shows.push([encodeURIComponent(card.dataset.name), card.dataset.year]);
+        }
+    });
+    if (visible_shows.length === 0) {
+        show_toast("Nothing to Add", "No addable shows are visible.");
+    }
+    else if (socket.connected) {
+        socket.emit('add_visible', visible_shows);
+    }
+    else {
+        show_toast("Connection Lost", "Please reload to continue.");
+    }
+});
+
 return_to_top.addEventListener("click", function () {
     window.scrollTo({ top: 0, behavior: "smooth" });
 });
 
 sonarr_select_all_checkbox.addEventListener("change", function () {
     var is_checked = this.checked;
-    var checkboxes = document.querySelectorAll('input[name="sonarr-item"]');
-    checkboxes.forEach(function (checkbox) {
-        checkbox.checked = is_checked;
+    Object.values(sonarr_pages).forEach(function (items) {
+        items.forEach(function (item) {
+            item.checked = is_checked;
+        });
     });
+    render_sonarr_rows();
+    socket.emit("sidebar_select", { "Query": sonarr_query, "All": is_checked });
+});
+
+sonarr_search.addEventListener("input", function () {
+    clearTimeout(sonarr_search_timer);
+    sonarr_search_timer = setTimeout(function () {
+        sonarr_query = sonarr_search.value;
+        sonarr_item_list.scrollTop = 0;
+        load_sonarr_list();
+    }, 250);
 });
 
+sonarr_item_list.addEventListener("scroll", schedule_sonarr_render);
+
 sonarr_get_shows_button.addEventListener('click', function () {
     sonarr_get_shows_button.disabled = true;
     sonarr_spinner.classList.remove('d-none');
     sonarr_status.textContent = "Accessing Sonarr API";
-    sonarr_item_list.innerHTML = '';
+    reset_sonarr_list();
     socket.emit("get_sonarr_shows");
 });
 
@@ -153,15 +290,12 @@ start_stop_button.addEventListener('click', function () {
         start_stop_button.classList.remove('btn-success');
         start_stop_button.classList.add('btn-warning');
         start_stop_button.textContent = "Stop";
-        var checked_items = Array.from(document.querySelectorAll('input[name="sonarr-item"]:checked'))
-            .map(item => item.value);
-        document.querySelectorAll('input[name="sonarr-item"]').forEach(item => {
-            item.disabled = true;
-        });
+        sonarr_running = true;
+        render_sonarr_rows();
         sonarr_get_shows_button.disabled = true;
         sonarr_select_all_checkbox.disabled = true;
-        socket.emit("start_req", checked_items);
-        if (checked_items.length > 0) {
+        socket.emit("start_req");
+        if (sonarr_selected > 0) {
             show_toast("Loading new shows");
         }
     }
@@ -169,9 +303,8 @@ start_stop_button.addEventListener('click', function () {
         start_stop_button.classList.add('btn-success');
         start_stop_button.classList.remove('btn-warning');
         start_stop_button.textContent = "Start";
-        document.querySelectorAll('input[name="sonarr-item"]').forEach(item => {
-            item.disabled = false;
-        });
+        sonarr_running = false;
+        render_sonarr_rows();
         sonarr_get_shows_button.disabled = false;
         sonarr_select_all_checkbox.disabled = false;
         socket.emit("stop_req");
@@ -185,6 +318,8 @@ save_changes_button.addEventListener("click", () => {
         "root_folder_path": root_folder_path.value,
         "tvdb_api_key": tvdb_api_key.value,
         "tmdb_api_key": tmdb_api_key.value,
+        "minimum_rating": minimum_rating.value,
+        "minimum_votes": minimum_votes.value,
     });
     save_message.style.display = "block";
     setTimeout(function () {
@@ -201,6 +336,8 @@ config_modal.addEventListener('show.bs.modal', function (event) {
         root_folder_path.value = settings.root_folder_path;
         tvdb_api_key.value = settings.tvdb_api_key;
         tmdb_api_key.value = settings.tmdb_api_key;
+        minimum_rating.value = settings.minimum_rating;
+        minimum_votes.value = settings.minimum_votes;
         socket.off("settingsLoaded", handle_settings_loaded);
     }
     socket.on("settingsLoaded", handle_settings_loaded);
@@ -232,41 +369,8 @@ window.addEventListener('touchend', () => {
 socket.on("sonarr_sidebar_update", (response) => {
     if (response.Status == "Success") {
         sonarr_status.textContent = "Sonarr List Retrieved";
-        sonarr_items = response.Data;
-        sonarr_item_list.innerHTML = '';
         sonarr_select_all_container.classList.remove('d-none');
-
-        for (var i = 0; i < sonarr_items.length; i++) {
-            var item = sonarr_items[i];
-
-            var div = document.createElement("div");
-            div.className = "form-check";
-
-            var input = document.createElement("input");
-            input.type = "checkbox";
-            input.className = "form-check-input";
-            input.id = "sonarr-" + i;
-            input.name = "sonarr-item";
-            input.value = item.name;
-
-            if (item.checked) {
-                input.checked = true;
-            }
-
-            var label = document.createElement("label");
-            label.className = "form-check-label";
-            label.htmlFor = "sonarr-" + i;
-            label.textContent = item.name;
-
-            input.addEventListener("change", function () {
-                check_if_all_selected();
-            });
-
-            div.appendChild(input);
-            div.appendChild(label);
-
-            sonarr_item_list.appendChild(div);
-        }
+        load_sonarr_list();
     }
     else {
         sonarr_status.textContent = response.Code;
@@ -276,7 +380,36 @@ socket.on("sonarr_sidebar_update", (response) => {
     load_sonarr_data(response);
 });
 
-socket.on("refresh_show", (show) => {
+socket.on("sonarr_sidebar_page", (response) => {
+    if (response.Query !== sonarr_query) {
+        return;
+    }
+    var page = Math.floor(response.Offset / sonarr_page_size);
+    sonarr_pending_pages.delete(page);
+    sonarr_pages[page] = response.Items;
+    if (response.Total !== sonarr_total) {
+        sonarr_total = response.Total;
+        sonarr_item_spacer.style.height = `${sonarr_total * sonarr_row_height}px`;
+    }
+    update_sonarr_selection(response);
+    render_sonarr_rows();
+});
+
+socket.on("sonarr_sidebar_selection", (selection) => {
+    update_sonarr_selection(selection);
+});
+
+socket.on("sonarr_sidebar_delta", () => {
+    if (!sonarr_select_all_container.classList.contains('d-none')) {
+        load_sonarr_list();
+    }
+});
+
+socket.on("refresh_show", (shows) => {
+    shows.forEach(refresh_show);
+});
+
+function refresh_show(show) {
     var show_cards = document.querySelectorAll('#show-column');
     show_cards.forEach(function (card) {
         var card_body = card.querySelector('.card-body');
@@ -293,6 +426,10 @@ socket.on("refresh_show", (show) => {
                 add_button.classList.add('btn-secondary');
                 add_button.disabled = true;
                 add_button.textContent = show.Status;
+            } else if (show.Status === "Queued") {
+                card_body.classList.add('status-blue');
+                add_button.disabled = true;
+                add_button.textContent = "Queued";
             } else if (show.Status === "Failed to Add" || show.Status === "Invalid Path" || show.Status === "Invalid Series ID") {
                 card_body.classList.add('status-red');
                 add_button.classList.remove('btn-primary');
@@ -306,18 +443,37 @@ socket.on("refresh_show", (show) => {
             return;
         }
     });
-});
+}
 
 socket.on('more_shows_loaded', function (data) {
     append_shows(data);
+    if (document.body.offsetHeight <= window.innerHeight) {
+        socket.emit('load_more_shows');
+    }
 });
 
 socket.on('clear', function () {
     clear_all();
 });
 
-socket.on("new_toast_msg", function (data) {
-    show_toast(data.title, data.message);
+socket.on("new_toast_msg", function (messages) {
+    messages.forEach(function (data) {
+        show_toast(data.title, data.message);
+    });
+});
+
+socket.on("job_status", function (jobs) {
+    jobs.forEach(function (job) {
+        if (job.Type === "sonarr" && job.Status === "Queued") {
+            sonarr_status.textContent = "Waiting for Sonarr request slot";
+        }
+        else if (job.Type === "sonarr" && job.Status === "Running") {
+            sonarr_status.textContent = "Accessing Sonarr API";
+        }
+        else if (job.Status === "Failed") {
+            show_toast("Request Failed", "Check the logs for details.");
+        }
+    });
 });
 
 socket.on("disconnect", function () {
@@ -337,13 +493,21 @@ let overview_request_flag = false;
 function overview_req(show) {
     if (!overview_request_flag) {
         overview_request_flag = true;
-        show_overview_modal(show);
+        socket.emit("overview_req", show.Id);
         setTimeout(() => {
             overview_request_flag = false;
         }, 1500);
     }
 }
 
+socket.on("overview_loaded", function (show) {
+    if (show.Error) {
+        show_toast("Overview Unavailable", show.Error);
+        return;
+    }
+    show_overview_modal(show);
+});
+
 function show_overview_modal(show) {
     const scrollbar_width = window.innerWidth - document.documentElement.clientWidth;
     document.body.style.overflow = 'hidden';